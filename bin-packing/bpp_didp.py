@@ -10,6 +10,28 @@ import read_bpp
 start = time.perf_counter()
 
 
+def compute_lb2_weight1(c, w):
+    return 1 if w > c / 2 else 0
+
+
+def compute_lb2_weight2(c, w):
+    return 0.5 if w == c / 2 else 0
+
+
+def compute_lb3_weight(c, w):
+    return (
+        1.0
+        if w > c * 2 / 3
+        else 2 / 3 // 0.001 / 1000
+        if w == c * 2 / 3
+        else 0.5
+        if w > c / 3
+        else 1 / 3 // 0.001 / 1000
+        if w == c / 3
+        else 0.0
+    )
+
+
 def create_model(n, c, weights):
     model = dp.Model()
 
@@ -19,26 +41,9 @@ def create_model(n, c, weights):
     bin_number = model.add_element_resource_var(item, 0, less_is_better=True)
 
     weight_table = model.add_int_table(weights)
-    lb2_weight1 = model.add_int_table(
-        [1 if weights[i] > c / 2 else 0 for i in range(n)]
-    )
-    lb2_weight2 = model.add_float_table(
-        [0.5 if weights[i] == c / 2 else 0 for i in range(n)]
-    )
-    lb3_weight = model.add_float_table(
-        [
-            1.0
-            if weights[i] > c * 2 / 3
-            else 2 / 3 // 0.001 / 1000
-            if weights[i] == c * 2 / 3
-            else 0.5
-            if weights[i] > c / 3
-            else 1 / 3 // 0.001 / 1000
-            if weights[i] == c / 3
-            else 0.0
-            for i in range(n)
-        ]
-    )
+    lb2_weight1 = model.add_int_table([compute_lb2_weight1(c, w) for w in weights])
+    lb2_weight2 = model.add_float_table([compute_lb2_weight2(c, w) for w in weights])
+    lb3_weight = model.add_float_table([compute_lb3_weight(c, w) for w in weights])
     model.add_base_case([unpacked.is_empty()])
 
     name_to_item = {}
@@ -69,12 +74,7 @@ def create_model(n, c, weights):
             preconditions=[
                 bin_number <= i,
                 unpacked.contains(i),
-                weight_table[i] > residual,
-            ]
-            + [
-                ~unpacked.contains(j) | (weight_table[j] > residual)
-                for j in range(n)
-                if i != j
+                weight_table.min(unpacked) > residual,
             ],
             effects=[
                 (unpacked, unpacked.remove(i)),
@@ -97,6 +97,84 @@ def create_model(n, c, weights):
     return model, name_to_item
 
 
+def create_multiset_model(c, group_weights, group_counts):
+    m = len(group_weights)
+    model = dp.Model()
+
+    group = model.add_object_type(m)
+    remaining = model.add_set_var(group, [k for k in range(m) if group_counts[k] > 0])
+    counts = [model.add_int_var(target=group_counts[k]) for k in range(m)]
+    residual = model.add_int_resource_var(0, less_is_better=False)
+
+    weight_table = model.add_int_table(group_weights)
+    model.add_base_case([remaining.is_empty()])
+
+    name_to_group = {}
+
+    for k in range(m):
+        # A group leaves the set when its last item is packed.
+        next_remaining = (counts[k] == 1).if_then_else(remaining.remove(k), remaining)
+
+        name = "pack {}".format(k)
+        name_to_group[name] = k
+        t = dp.Transition(
+            name=name,
+            cost=dp.IntExpr.state_cost(),
+            effects=[
+                (counts[k], counts[k] - 1),
+                (remaining, next_remaining),
+                (residual, residual - group_weights[k]),
+            ],
+            preconditions=[remaining.contains(k), group_weights[k] <= residual],
+        )
+        model.add_transition(t)
+
+        # A new bin starts with an item of the largest remaining weight.
+        name = "open a new bin and pack {}".format(k)
+        name_to_group[name] = k
+        ft = dp.Transition(
+            name=name,
+            cost=dp.IntExpr.state_cost() + 1,
+            preconditions=[
+                remaining.contains(k),
+                weight_table.max(remaining) <= group_weights[k],
+                weight_table.min(remaining) > residual,
+            ],
+            effects=[
+                (counts[k], counts[k] - 1),
+                (remaining, next_remaining),
+                (residual, c - group_weights[k]),
+            ],
+        )
+        model.add_transition(ft, forced=True)
+
+    lb2_weight1 = [compute_lb2_weight1(c, w) for w in group_weights]
+    lb2_weight2 = [compute_lb2_weight2(c, w) for w in group_weights]
+    lb3_weight = [compute_lb3_weight(c, w) for w in group_weights]
+    model.add_dual_bound(
+        math.ceil((sum(group_weights[k] * counts[k] for k in range(m)) - residual) / c)
+    )
+    model.add_dual_bound(
+        sum(lb2_weight1[k] * counts[k] for k in range(m) if lb2_weight1[k] > 0)
+        + math.ceil(
+            sum(lb2_weight2[k] * counts[k] for k in range(m) if lb2_weight2[k] > 0)
+        )
+        - (residual >= c / 2).if_then_else(1, 0)
+    )
+    model.add_dual_bound(
+        math.ceil(sum(lb3_weight[k] * counts[k] for k in range(m) if lb3_weight[k] > 0))
+        - (residual >= c / 3).if_then_else(1, 0)
+    )
+
+    return model, name_to_group
+
+
+def decode_multiset_solution(solution, group_to_items):
+    group_to_items = [list(items) for items in group_to_items]
+
+    return [[group_to_items[k].pop() for k in groups] for groups in solution]
+
+
 def solve(
     model,
     name_to_item,
@@ -107,7 +185,13 @@ def solve(
     initial_beam_size=1,
     threads=1,
     parallel_type=0,
+    initial_solution=None,
 ):
+    if initial_solution is None:
+        primal_bound = None
+    else:
+        primal_bound = len(initial_solution)
+
     if solver_name == "LNBS":
         if parallel_type == 2:
             parallelization_method = dp.BeamParallelizationMethod.Sbs
@@ -118,6 +202,7 @@ def solve(
 
         solver = dp.LNBS(
             model,
+            primal_bound=primal_bound,
             initial_beam_size=initial_beam_size,
             seed=seed,
             parallelization_method=parallelization_method,
@@ -126,23 +211,45 @@ def solve(
             quiet=False,
         )
     elif solver_name == "DD-LNS":
-        solver = dp.DDLNS(model, time_limit=time_limit, quiet=False, seed=seed)
+        solver = dp.DDLNS(
+            model,
+            primal_bound=primal_bound,
+            time_limit=time_limit,
+            quiet=False,
+            seed=seed,
+        )
     elif solver_name == "FR":
-        solver = dp.ForwardRecursion(model, time_limit=time_limit, quiet=False)
+        solver = dp.ForwardRecursion(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "BrFS":
-        solver = dp.BreadthFirstSearch(model, time_limit=time_limit, quiet=False)
+        solver = dp.BreadthFirstSearch(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "CAASDy":
-        solver = dp.CAASDy(model, time_limit=time_limit, quiet=False)
+        solver = dp.CAASDy(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "DFBB":
-        solver = dp.DFBB(model, time_limit=time_limit, quiet=False)
+        solver = dp.DFBB(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "CBFS":
-        solver = dp.CBFS(model, time_limit=time_limit, quiet=False)
+        solver = dp.CBFS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "ACPS":
-        solver = dp.ACPS(model, time_limit=time_limit, quiet=False)
+        solver = dp.ACPS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "APPS":
-        solver = dp.APPS(model, time_limit=time_limit, quiet=False)
+        solver = dp.APPS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "DBDFS":
-        solver = dp.DBDFS(model, time_limit=time_limit, quiet=False)
+        solver = dp.DBDFS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     else:
         if parallel_type == 2:
             parallelization_method = dp.BeamParallelizationMethod.Sbs
@@ -153,6 +260,7 @@ def solve(
 
         solver = dp.CABS(
             model,
+            primal_bound=primal_bound,
             initial_beam_size=initial_beam_size,
             threads=threads,
             parallelization_method=parallelization_method,
@@ -164,6 +272,10 @@ def solve(
         solution = solver.search()
     else:
         with open(history, "w") as f:
+            if initial_solution is not None:
+                f.write("{}, {}\n".format(time.perf_counter() - start, primal_bound))
+                f.flush()
+
             is_terminated = False
 
             while not is_terminated:
@@ -179,6 +291,13 @@ def solve(
     print("Expanded: {}".format(solution.expanded))
     print("Generated: {}".format(solution.generated))
 
+    if solution.cost is None and initial_solution is not None:
+        # No better solution than the initial one exists if the search terminates.
+        if solution.is_optimal or solution.is_infeasible:
+            return initial_solution, primal_bound, primal_bound, True, False
+        else:
+            return initial_solution, primal_bound, solution.best_bound, False, False
+
     if solution.is_infeasible:
         return None, None, None, False, True
     else:
@@ -209,10 +328,38 @@ if __name__ == "__main__":
     parser.add_argument("--threads", default=1, type=int)
     parser.add_argument("--initial-beam-size", default=1, type=int)
     parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--primal-heuristic", action="store_true")
+    parser.add_argument("--multiset", action="store_true")
     args = parser.parse_args()
 
     n, c, weights = read_bpp.read(args.input)
-    model, name_to_item = create_model(n, c, weights)
+
+    if args.multiset:
+        group_weights, group_to_items = read_bpp.group_items_by_weight(weights)
+        model, name_to_item = create_multiset_model(
+            c, group_weights, [len(items) for items in group_to_items]
+        )
+    else:
+        model, name_to_item = create_model(n, c, weights)
+
+    if args.primal_heuristic:
+        initial_solution = min(
+            read_bpp.first_fit_decreasing_solution(c, weights),
+            read_bpp.best_fit_decreasing_solution(c, weights),
+            key=len,
+        )
+        print("initial cost: {}".format(len(initial_solution)))
+
+        if args.multiset:
+            item_to_group = {
+                i: k for k, items in enumerate(group_to_items) for i in items
+            }
+            initial_solution = [
+                [item_to_group[i] for i in items] for items in initial_solution
+            ]
+    else:
+        initial_solution = None
+
     solution, cost, bound, is_optimal, is_infeasible = solve(
         model,
         name_to_item,
@@ -223,6 +370,7 @@ if __name__ == "__main__":
         threads=args.threads,
         initial_beam_size=args.initial_beam_size,
         parallel_type=args.parallel_type,
+        initial_solution=initial_solution,
     )
 
     if is_infeasible:
@@ -231,6 +379,9 @@ if __name__ == "__main__":
         print("best bound: {}".format(bound))
 
         if cost is not None:
+            if args.multiset:
+                solution = decode_multiset_solution(solution, group_to_items)
+
             print(solution)
             print("cost: {}".format(cost))
 
@@ -1,3 +1,4 @@
+import bisect
 import math
 
 
@@ -12,23 +13,76 @@ def read(filename):
     return n, c, weights
 
 
+def first_fit_decreasing_solution(c, weights):
+    n = len(weights)
+    size = 1
+
+    while size < n:
+        size *= 2
+
+    # A segment tree over bins keeps the maximum residual capacity of each range.
+    tree = [c] * (2 * size)
+    solution = []
+
+    for i in sorted(range(n), key=lambda i: weights[i], reverse=True):
+        k = 1
+
+        while k < size:
+            k = 2 * k if tree[2 * k] >= weights[i] else 2 * k + 1
+
+        b = k - size
+
+        if b == len(solution):
+            solution.append([])
+
+        solution[b].append(i)
+        tree[k] -= weights[i]
+        k //= 2
+
+        while k > 0:
+            tree[k] = max(tree[2 * k], tree[2 * k + 1])
+            k //= 2
+
+    return solution
+
+
+def best_fit_decreasing_solution(c, weights):
+    residuals = []
+    solution = []
+
+    for i in sorted(range(len(weights)), key=lambda i: weights[i], reverse=True):
+        k = bisect.bisect_left(residuals, (weights[i], -1))
+
+        if k == len(residuals):
+            b = len(solution)
+            solution.append([])
+            r = c
+        else:
+            r, b = residuals.pop(k)
+
+        solution[b].append(i)
+        bisect.insort(residuals, (r - weights[i], b))
+
+    return solution
+
+
 def first_fit_decreasing(c, weights):
     weights_decreasing = sorted(weights, reverse=True)
-    bins = [0]
+    ub = max(len(first_fit_decreasing_solution(c, weights)), 1)
 
-    for w in weights_decreasing:
-        no_fit = True
-        for i, r in enumerate(bins):
-            if r + w <= c:
-                bins[i] += w
-                no_fit = False
-                break
-        if no_fit:
-            bins.append(w)
+    return ub, weights_decreasing
 
-    ub = len(bins)
 
-    return ub, weights_decreasing
+def group_items_by_weight(weights):
+    weight_to_items = {}
+
+    for i, w in enumerate(weights):
+        weight_to_items.setdefault(w, []).append(i)
+
+    group_weights = sorted(weight_to_items, reverse=True)
+    group_to_items = [weight_to_items[w] for w in group_weights]
+
+    return group_weights, group_to_items
 
 
 def continuous_lb(c, weights):
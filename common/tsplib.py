@@ -0,0 +1,419 @@
+import itertools
+import math
+
+
+def tsplib_round(x):
+    return math.floor(x + 0.5)
+
+
+def tokenize(filename):
+    specification = {}
+    sections = {}
+    tokens = None
+
+    with open(filename) as f:
+        for line in f:
+            stripped = line.strip()
+
+            if len(stripped) == 0:
+                continue
+
+            if stripped[0].isalpha():
+                # Generated instances may contain data after EOF.
+                if stripped == "EOF":
+                    tokens = None
+                    continue
+
+                keyword = stripped.split(":", 1)[0].split()[0]
+
+                if keyword.endswith("_SECTION"):
+                    tokens = []
+                    sections[keyword] = tokens
+                    continue
+
+                value = stripped[len(keyword) :].strip()
+
+                if value.startswith(":"):
+                    value = value[1:].strip()
+
+                specification[keyword] = value
+                tokens = None
+                continue
+
+            if tokens is not None:
+                tokens.extend(stripped.split())
+
+    return specification, sections
+
+
+def read_coordinates(n, tokens, dimension):
+    nodes = []
+    coordinates = {}
+    width = dimension + 1
+
+    for position in range(0, width * n, width):
+        i = int(tokens[position])
+        nodes.append(i)
+        coordinates[i] = tuple(
+            float(c) for c in tokens[position + 1 : position + width]
+        )
+
+    return nodes, coordinates
+
+
+def euclidean(p, q):
+    return tsplib_round(math.sqrt(sum((a - b) ** 2 for a, b in zip(p, q))))
+
+
+def manhattan(p, q):
+    return tsplib_round(sum(abs(a - b) for a, b in zip(p, q)))
+
+
+def maximum(p, q):
+    return max(tsplib_round(abs(a - b)) for a, b in zip(p, q))
+
+
+def ceil_euclidean(p, q):
+    return math.ceil(math.sqrt(sum((a - b) ** 2 for a, b in zip(p, q))))
+
+
+def pseudo_euclidean(p, q):
+    rij = math.sqrt(sum((a - b) ** 2 for a, b in zip(p, q)) / 10.0)
+    tij = tsplib_round(rij)
+
+    if tij < rij:
+        return tij + 1
+    else:
+        return tij
+
+
+def to_geographical(p):
+    PI = 3.141592
+    result = []
+
+    for x in p:
+        deg = int(x)
+        min = x - deg
+        result.append(PI * (deg + 5.0 * min / 3.0) / 180.0)
+
+    return tuple(result)
+
+
+def geographical(p, q):
+    RRR = 6378.388
+    q1 = math.cos(p[1] - q[1])
+    q2 = math.cos(p[0] - q[0])
+    q3 = math.cos(p[0] + q[0])
+
+    return int(RRR * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+
+COORDINATE_TYPES = {
+    "EUC_2D": (2, euclidean),
+    "EUC_3D": (3, euclidean),
+    "MAN_2D": (2, manhattan),
+    "MAN_3D": (3, manhattan),
+    "MAX_2D": (2, maximum),
+    "MAX_3D": (3, maximum),
+    "CEIL_2D": (2, ceil_euclidean),
+    "ATT": (2, pseudo_euclidean),
+    "GEO": (2, geographical),
+}
+
+
+def read_coordinate_edges(edge_weight_type, n, sections):
+    dimension, distance = COORDINATE_TYPES[edge_weight_type]
+    nodes, coordinates = read_coordinates(n, sections["NODE_COORD_SECTION"], dimension)
+
+    if edge_weight_type == "GEO":
+        coordinates = {i: to_geographical(p) for i, p in coordinates.items()}
+
+    edges = {}
+
+    for k, i in enumerate(nodes):
+        for j in nodes[k + 1 :]:
+            edges[i, j] = distance(coordinates[i], coordinates[j])
+            edges[j, i] = edges[i, j]
+
+    return nodes, edges, True
+
+
+def full_matrix_indices(n):
+    return ((i, j) for i in range(1, n + 1) for j in range(1, n + 1))
+
+
+def upper_row_indices(n):
+    return ((i, j) for i in range(1, n) for j in range(i + 1, n + 1))
+
+
+def lower_row_indices(n):
+    return ((i, j) for i in range(2, n + 1) for j in range(1, i))
+
+
+def upper_diag_row_indices(n):
+    return ((i, j) for i in range(1, n + 1) for j in range(i, n + 1))
+
+
+def lower_diag_row_indices(n):
+    return ((i, j) for i in range(1, n + 1) for j in range(1, i + 1))
+
+
+# A column-wise triangle of a symmetric matrix enumerates the same entries as
+# the opposite row-wise triangle.
+EXPLICIT_FORMATS = {
+    "FULL_MATRIX": (full_matrix_indices, lambda n: n * n),
+    "UPPER_ROW": (upper_row_indices, lambda n: n * (n - 1) // 2),
+    "LOWER_ROW": (lower_row_indices, lambda n: n * (n - 1) // 2),
+    "UPPER_COL": (lower_row_indices, lambda n: n * (n - 1) // 2),
+    "LOWER_COL": (upper_row_indices, lambda n: n * (n - 1) // 2),
+    "UPPER_DIAG_ROW": (upper_diag_row_indices, lambda n: n * (n + 1) // 2),
+    "LOWER_DIAG_ROW": (lower_diag_row_indices, lambda n: n * (n + 1) // 2),
+    "UPPER_DIAG_COL": (lower_diag_row_indices, lambda n: n * (n + 1) // 2),
+    "LOWER_DIAG_COL": (upper_diag_row_indices, lambda n: n * (n + 1) // 2),
+}
+
+
+def read_explicit_edges(edge_weight_format, n, sections):
+    indices, size = EXPLICIT_FORMATS[edge_weight_format]
+    entries = sections["EDGE_WEIGHT_SECTION"]
+
+    # Some files (e.g., SOP) start the section with the dimension.
+    if len(entries) == size(n) + 1 and int(entries[0]) == n:
+        entries = entries[1:]
+
+    edges = dict(zip(indices(n), map(int, entries)))
+
+    if edge_weight_format == "FULL_MATRIX":
+        symmetric = all(edges[i, j] == edges[j, i] for i, j in upper_row_indices(n))
+
+        return list(range(1, n + 1)), edges, symmetric
+
+    edges.update({(j, i): c for (i, j), c in edges.items()})
+
+    return list(range(1, n + 1)), edges, True
+
+
+def read_edges(specification, sections):
+    n = int(specification["DIMENSION"])
+    edge_weight_type = specification["EDGE_WEIGHT_TYPE"]
+
+    if edge_weight_type in COORDINATE_TYPES:
+        return read_coordinate_edges(edge_weight_type, n, sections)
+
+    if edge_weight_type == "EXPLICIT":
+        edge_weight_format = specification["EDGE_WEIGHT_FORMAT"]
+
+        if edge_weight_format in EXPLICIT_FORMATS:
+            return read_explicit_edges(edge_weight_format, n, sections)
+
+    return None, None, None
+
+
+def read_demand(n, specification, sections):
+    dimension = int(specification.get("DEMAND_DIMENSION", 1))
+    width = dimension + 1
+    tokens = sections["DEMAND_SECTION"][: width * n]
+    ids = map(int, tokens[::width])
+    del tokens[::width]
+    demand = dict(
+        zip(itertools.product(ids, range(1, dimension + 1)), map(int, tokens))
+    )
+
+    return dimension, demand
+
+
+def read_depots(sections):
+    depots = []
+
+    for token in sections["DEPOT_SECTION"]:
+        d = int(token)
+
+        if d == -1:
+            break
+
+        depots.append(d)
+
+    return depots
+
+
+def read_tsp(filename):
+    specification, sections = tokenize(filename)
+    assert specification["TYPE"].split()[0] in ("TSP", "ATSP", "SOP")
+    n = int(specification["DIMENSION"])
+    nodes, edges, symmetric = read_edges(specification, sections)
+
+    return n, nodes, edges, symmetric
+
+
+def read_cvrp(filename):
+    specification, sections = tokenize(filename)
+    assert specification["TYPE"].split()[0] == "CVRP"
+    n = int(specification["DIMENSION"])
+    capacity = int(specification["CAPACITY"])
+    nodes, edges, symmetric = read_edges(specification, sections)
+    _, demand = read_demand(n, specification, sections)
+    demand = {i: d for (i, _), d in demand.items()}
+    depots = read_depots(sections)
+    assert len(depots) == 1
+
+    return n, nodes, edges, capacity, demand, depots[0], symmetric
+
+
+def validate_cvrp(n, nodes, edges, capacity, demand, depot, solution, cost, k=None):
+    if solution[0] != depot:
+        print(
+            "The tour does not start from the depot {} but from {}".format(
+                depot, solution[0]
+            )
+        )
+        return False
+    previous = solution[0]
+    actual_cost = 0
+    load = 0
+    n_vehicles = 0
+    visited = set([depot])
+    for i in solution[1:]:
+        if previous == depot:
+            n_vehicles += 1
+            if k is not None and n_vehicles > k:
+                print(
+                    "The number of vehicles {} exceeds the limit {}".format(
+                        n_vehicles, k
+                    )
+                )
+                return False
+
+        if i not in nodes:
+            print("No such customer {}".format(i))
+            return False
+
+        if (previous, i) not in edges and not (previous == i == depot):
+            print("No such edge ({}, {})".format(previous, i))
+            return False
+
+        if previous == i == depot:
+            actual_cost += 0
+        else:
+            actual_cost += edges[previous, i]
+
+        if i == depot:
+            load = 0
+        else:
+            if i in visited:
+                print("Customer {} is already visited".format(i))
+                return False
+            visited.add(i)
+            load += demand[i]
+            if load > capacity:
+                print(
+                    "load {} at customer {} exceeds the capacity {}".format(
+                        load, i, capacity
+                    )
+                )
+                return False
+
+        previous = i
+
+    if previous != depot:
+        print(
+            "The tour does not return to the depot {} but to {}".format(depot, previous)
+        )
+        return False
+
+    if len(visited) != n:
+        print(
+            "The number of visited customers is {}, but should be {}".format(
+                len(visited), n
+            )
+        )
+
+    if actual_cost != cost:
+        print(
+            "The cost of the solution {} mismatches the actual cost {}".format(
+                cost, actual_cost
+            )
+        )
+        return False
+
+    return True
+
+
+def read_mpdtsp(filename):
+    specification, sections = tokenize(filename)
+    n = int(specification["DIMENSION"])
+    capacity = int(specification["CAPACITY"])
+    nodes, edges, symmetric = read_edges(specification, sections)
+    m, demand = read_demand(n, specification, sections)
+    items = list(range(1, m + 1))
+
+    return n, nodes, edges, capacity, m, items, demand, symmetric
+
+
+def validate_mpdtsp(solution, cost, nodes, edges, capacity, items, demand):
+    unvisited = set(nodes)
+    load = {i: 0 for i in items}
+    actual_cost = 0
+    previous = None
+
+    for i in solution:
+        if previous is None:
+            if i != nodes[0]:
+                print(
+                    "The tour does not start from depot {}, but from {}".format(
+                        nodes[0], i
+                    )
+                )
+                return False
+        else:
+            if (previous, i) not in edges:
+                print("No such edge ({}, {})".format(previous, i))
+                return False
+
+            actual_cost += edges[previous, i]
+
+        if i not in nodes:
+            print("No such node {}".format(i))
+            return False
+
+        if i not in unvisited:
+            print("Node {} is already visited".format(i))
+            return False
+
+        unvisited.remove(i)
+
+        for j in items:
+            load[j] += demand[i, j]
+
+        for j in items:
+            if load[j] < 0:
+                print("The weight {} for item {} is negative".format(load[j], j))
+                return False
+
+        load_sum = sum(load.values())
+
+        if load_sum > capacity:
+            print(
+                "The sum of weights {} at node {} exceeds the capacity {}".format(
+                    load_sum, i, capacity
+                )
+            )
+            return False
+
+        previous = i
+
+    if len(unvisited) > 0:
+        print("Nodes {} are unvisited".format(unvisited))
+        return False
+
+    if i != nodes[-1]:
+        print("The tour does not end at depot {}, but at {}".format(nodes[-1], i))
+
+    if actual_cost != cost:
+        print(
+            "The cost of the solution {} mismatches the actual cost {}".format(
+                cost, actual_cost
+            )
+        )
+        return False
+
+    return True
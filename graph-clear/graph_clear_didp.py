@@ -9,25 +9,38 @@ import read_graph_clear
 start = time.perf_counter()
 
 
-def create_model(n, node_weights, edge_weights):
+def create_model(n, node_weights, edge_weights, cut_bound=False):
+    edge_weight_matrix = [
+        [
+            edge_weights[i, j]
+            if (i, j) in edge_weights
+            else edge_weights[j, i]
+            if (j, i) in edge_weights
+            else 0
+            for j in range(n)
+        ]
+        for i in range(n)
+    ]
+
+    incident_weights = [sum(row) for row in edge_weight_matrix]
+    # Interchangeable nodes are swept in the order of their indices.
+    previous_twin = [None] * n
+
+    for nodes in read_graph_clear.compute_equivalence_classes(
+        n, node_weights, edge_weights
+    ):
+        for j, i in zip(nodes, nodes[1:]):
+            previous_twin[i] = j
+
     model = dp.Model()
     node = model.add_object_type(n)
     clean = model.add_set_var(node, [])
+    # Total weight of the edges between clean and contaminated nodes.
+    cut = model.add_int_var(target=0)
     all_nodes = model.create_set_const(node, [i for i in range(n)])
     a = model.add_int_table(node_weights)
-    b = model.add_int_table(
-        [
-            [
-                edge_weights[i, j]
-                if (i, j) in edge_weights
-                else edge_weights[j, i]
-                if (j, i) in edge_weights
-                else 0
-                for j in range(n)
-            ]
-            for i in range(n)
-        ]
-    )
+    b = model.add_int_table(edge_weight_matrix)
+    incident = model.add_int_table(incident_weights)
 
     model.add_base_case([all_nodes <= clean])
 
@@ -36,18 +49,39 @@ def create_model(n, node_weights, edge_weights):
     for i in range(n):
         name = "sweep {}".format(i)
         name_to_node[name] = i
+        preconditions = [~clean.contains(i)]
+
+        if previous_twin[i] is not None:
+            preconditions.append(clean.contains(previous_twin[i]))
+
         t = dp.Transition(
             name=name,
             cost=dp.max(
                 dp.IntExpr.state_cost(),
-                a[i] + b[i, all_nodes] + b[clean, clean.complement().remove(i)],
+                a[i] + incident[i] + cut - b[i, clean],
             ),
-            effects=[(clean, clean.add(i))],
-            preconditions=[~clean.contains(i)],
+            effects=[
+                (clean, clean.add(i)),
+                (cut, cut + incident[i] - 2 * b[i, clean]),
+            ],
+            preconditions=preconditions,
         )
         model.add_transition(t)
 
-    model.add_dual_bound(0)
+    if cut_bound:
+        # Each remaining node is swept once, and the next sweep also pays the
+        # current cut except the edges to the swept node.
+        sweep_cost = model.add_int_table(
+            [node_weights[i] + incident_weights[i] for i in range(n)]
+        )
+        remaining = clean.complement()
+        model.add_dual_bound(
+            remaining.is_empty().if_then_else(
+                0, dp.max(sweep_cost.max(remaining), a.min(remaining) + cut)
+            )
+        )
+    else:
+        model.add_dual_bound(0)
 
     return model, name_to_node
 
@@ -174,10 +208,11 @@ if __name__ == "__main__":
     parser.add_argument("--threads", default=1, type=int)
     parser.add_argument("--initial-beam-size", default=1, type=int)
     parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--cut-bound", action="store_true")
     args = parser.parse_args()
 
     n, a, b = read_graph_clear.read(args.input)
-    model, name_to_node = create_model(n, a, b)
+    model, name_to_node = create_model(n, a, b, cut_bound=args.cut_bound)
     solution, cost, bound, is_optimal, is_infeasible = solve(
         model,
         name_to_node,
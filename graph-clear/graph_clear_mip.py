@@ -31,7 +31,9 @@ def solve(
     verbose=False,
     history=None,
 ):
+    build_start = time.perf_counter()
     nodes = list(range(n))
+    edges = list(edge_weights)
     z_lb = 1
     z_ub = max(node_weights) + sum(edge_weights.values())
 
@@ -44,38 +46,35 @@ def solve(
         model.setParam("OutputFlag", 0)
 
     x = model.addVars(nodes, nodes, vtype=gp.GRB.BINARY)
-    y = model.addVars(edge_weights, nodes, vtype=gp.GRB.BINARY)
+    # Edge variables are created only for the edges of the graph.
+    y = model.addVars(edges, nodes, vtype=gp.GRB.BINARY)
     z = model.addVar(vtype=gp.GRB.CONTINUOUS, lb=z_lb, ub=z_ub, obj=1)
+    edge_coefficients = [edge_weights[e] for e in edges]
 
     model.addConstr(
         z
-        >= gp.quicksum(node_weights[i] * x[i, 0] for i in nodes)
-        + gp.quicksum(b * y[i, j, 0] for (i, j), b in edge_weights.items())
+        >= gp.LinExpr(node_weights, [x[i, 0] for i in nodes])
+        + gp.LinExpr(edge_coefficients, [y[i, j, 0] for (i, j) in edges])
     )
     model.addConstrs(
         z
-        >= gp.quicksum(node_weights[i] * (x[i, t] - x[i, t - 1]) for i in nodes)
-        + gp.quicksum(b * y[i, j, t] for (i, j), b in edge_weights.items())
+        >= gp.LinExpr(node_weights, [x[i, t] for i in nodes])
+        - gp.LinExpr(node_weights, [x[i, t - 1] for i in nodes])
+        + gp.LinExpr(edge_coefficients, [y[i, j, t] for (i, j) in edges])
         for t in range(1, n)
     )
-    model.addConstrs(gp.quicksum(x[i, t] for i in nodes) == t + 1 for t in nodes)
+    model.addConstrs(x.sum("*", t) == t + 1 for t in nodes)
     model.addConstrs(x[i, t] <= x[i, t + 1] for i in nodes for t in range(n - 1))
+    model.addConstrs(x[i, t] - x[j, t] <= y[i, j, t] for (i, j) in edges for t in nodes)
+    model.addConstrs(x[j, t] - x[i, t] <= y[i, j, t] for (i, j) in edges for t in nodes)
     model.addConstrs(
-        x[i, t] - x[j, t] <= y[i, j, t] for (i, j) in edge_weights for t in nodes
+        x[i, t] - x[i, t - 1] <= y[i, j, t] for (i, j) in edges for t in range(1, n)
     )
     model.addConstrs(
-        x[j, t] - x[i, t] <= y[i, j, t] for (i, j) in edge_weights for t in nodes
-    )
-    model.addConstrs(
-        x[i, t] - x[i, t - 1] <= y[i, j, t]
-        for (i, j) in edge_weights
-        for t in range(1, n)
-    )
-    model.addConstrs(
-        x[j, t] - x[j, t - 1] <= y[i, j, t]
-        for (i, j) in edge_weights
-        for t in range(1, n)
+        x[j, t] - x[j, t - 1] <= y[i, j, t] for (i, j) in edges for t in range(1, n)
     )
+    model.update()
+    print("Build time: {}s".format(time.perf_counter() - build_start))
 
     if history is None:
         model.optimize()
@@ -91,28 +90,25 @@ def solve(
     if status == gp.GRB.INFEASIBLE:
         print("infeasible")
     elif sol_count > 0:
+        x_values = model.getAttr("X", x)
+        sweep_time = {i: min(t for t in nodes if x_values[i, t] > 0.5) for i in nodes}
+        solution = sorted(nodes, key=lambda i: (sweep_time[i], i))
+        neighbors = [[] for _ in nodes]
+
+        for (u, v), b in edge_weights.items():
+            neighbors[u].append((v, b))
+            neighbors[v].append((u, b))
+
         clean = set()
-        solution = []
-        for t in nodes:
-            for i in nodes:
-                if i not in clean and x[i, t].X > 0.5:
-                    delta_c = set(
-                        (u, v)
-                        for (u, v) in edge_weights
-                        if (u in clean and v not in clean)
-                        or (u not in clean and v in clean)
-                    )
-                    delta_sigma = set(
-                        (u, v) for (u, v) in edge_weights if u == i or v == i
-                    )
-                    delta = delta_c.union(delta_sigma)
-                    robots = node_weights[i] + sum(
-                        edge_weights[u, v] for (u, v) in delta
-                    )
-                    print("sweep {}, robots: {}".format(i, robots))
-                    clean.add(i)
-                    solution.append(i)
-                    continue
+        cut = 0
+
+        for i in solution:
+            incident = sum(b for _, b in neighbors[i])
+            to_clean = sum(b for j, b in neighbors[i] if j in clean)
+            robots = node_weights[i] + incident + cut - to_clean
+            print("sweep {}, robots: {}".format(i, robots))
+            clean.add(i)
+            cut += incident - 2 * to_clean
 
         cost = round(model.objVal)
         print(solution)
@@ -2,40 +2,64 @@ import os
 import argparse
 import math
 import random
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
 
 
-def generate_connected_graph(n, p):
+def generate_connected_graph(n, p, rng=random):
     m = math.ceil(p * n * (n - 1) / 2)
-    G = nx.gnm_random_graph(n, m)
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    order = list(range(n))
+    rng.shuffle(order)
 
-    while not nx.is_connected(G):
-        G = nx.gnm_random_graph(n, m)
+    # A random spanning tree makes the graph connected without retrying.
+    for k in range(1, n):
+        G.add_edge(order[k], order[rng.randrange(k)])
+
+    non_edges = [
+        (u, v) for u in range(n) for v in range(u + 1, n) if not G.has_edge(u, v)
+    ]
+    G.add_edges_from(rng.sample(non_edges, max(m - G.number_of_edges(), 0)))
 
     return G
 
 
-def generate_weights(G, node_min, node_max, edge_min, edge_max):
+def generate_weights(G, node_min, node_max, edge_min, edge_max, rng=random):
     for v in G:
-        G.nodes[v]["weight"] = random.randint(node_min, node_max)
+        G.nodes[v]["weight"] = rng.randint(node_min, node_max)
     for u, v in G.edges:
-        G.edges[u, v]["weight"] = random.randint(edge_min, edge_max)
+        G.edges[u, v]["weight"] = rng.randint(edge_min, edge_max)
 
 
 def write_to_file(G, filename):
+    index = {v: k for k, v in enumerate(G)}
+    lines = [
+        "{} {}\n".format(len(G), len(G.edges)),
+        " ".join(str(G.nodes[u]["weight"]) for u in G) + "\n",
+    ]
+
+    for u in G:
+        row = ["0"] * len(G)
+
+        for v, data in G.adj[u].items():
+            row[index[v]] = str(data["weight"])
+
+        lines.append(" ".join(row) + "\n")
+
     with open(filename, "w") as f:
-        f.write("{} {}\n".format(len(G), len(G.edges)))
-        f.write(" ".join(str(G.nodes[u]["weight"]) for u in G) + "\n")
+        f.writelines(lines)
 
-        for u in G:
-            line = ""
-            for v in G:
-                if G.has_edge(u, v):
-                    line += "{} ".format(G.edges[u, v]["weight"])
-                else:
-                    line += "0 "
-            f.write(line + "\n")
+
+def generate_instance(n, p, i, node_min, node_max, edge_min, edge_max, seed, filepath):
+    # Seeding by the instance parameters makes instances independent of each other.
+    rng = random.Random("{} {} {} {}".format(seed, n, p, i))
+    G = generate_connected_graph(n, p, rng=rng)
+    generate_weights(G, node_min, node_max, edge_min, edge_max, rng=rng)
+    write_to_file(G, filepath)
+
+    return filepath
 
 
 if __name__ == "__main__":
@@ -51,10 +75,11 @@ if __name__ == "__main__":
     parser.add_argument("--node-max", type=int, default=10)
     parser.add_argument("--edge-min", type=int, default=1)
     parser.add_argument("--edge-max", type=int, default=4)
+    parser.add_argument("--workers", "-w", type=int, default=None)
     args = parser.parse_args()
 
-    random.seed(args.seed)
     os.makedirs(args.output_dir, exist_ok=True)
+    filepaths = []
 
     for n in args.ns:
         dirname = "random_n{}".format(n)
@@ -62,10 +87,25 @@ if __name__ == "__main__":
         os.makedirs(dirpath, exist_ok=True)
         for p in args.ps:
             for i in range(1, args.n_instances + 1):
-                G = generate_connected_graph(n, p)
-                generate_weights(
-                    G, args.node_min, args.node_max, args.edge_min, args.edge_max
-                )
                 filename = "p{}_seed{}_{}".format(p, args.seed, i)
-                filepath = os.path.join(dirpath, filename)
-                write_to_file(G, filepath)
+                filepaths.append((n, p, i, os.path.join(dirpath, filename)))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(
+                generate_instance,
+                n,
+                p,
+                i,
+                args.node_min,
+                args.node_max,
+                args.edge_min,
+                args.edge_max,
+                args.seed,
+                filepath,
+            )
+            for n, p, i, filepath in filepaths
+        ]
+
+        for future in futures:
+            print(future.result())
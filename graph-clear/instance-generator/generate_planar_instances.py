@@ -1,39 +1,114 @@
 import os
 import argparse
+import math
 import random
-
-import subprocess
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
 
 import generate_instances
 
 
-def generate_planner_graphs(n_instances, ns, command, output_path):
-    n_to_graphs = {n: [] for n in ns}
+def orientation(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def in_circumcircle(a, b, c, p):
+    adx, ady = a[0] - p[0], a[1] - p[1]
+    bdx, bdy = b[0] - p[0], b[1] - p[1]
+    cdx, cdy = c[0] - p[0], c[1] - p[1]
+    det = (
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        - (bdx * bdx + bdy * bdy) * (adx * cdy - cdx * ady)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+
+    return det * orientation(a, b, c) > 0
+
+
+def delaunay_edges(points):
+    n = len(points)
+    # The super triangle contains the unit square with a wide margin.
+    vertices = points + [(-100.0, -100.0), (100.0, -100.0), (0.0, 100.0)]
+    triangles = {(n, n + 1, n + 2)}
+
+    for k, p in enumerate(points):
+        bad = [
+            t
+            for t in triangles
+            if in_circumcircle(vertices[t[0]], vertices[t[1]], vertices[t[2]], p)
+        ]
+        edge_count = {}
 
-    while any(len(graphs) < n_instances for graphs in n_to_graphs.values()):
-        p = subprocess.Popen(
-            command,
-            shell=True,
-            stdout=subprocess.PIPE,
+        for u, v, w in bad:
+            for edge in ((u, v), (v, w), (w, u)):
+                key = tuple(sorted(edge))
+                edge_count[key] = edge_count.get(key, 0) + 1
+
+        triangles.difference_update(bad)
+        triangles.update(
+            (u, v, k) for (u, v), count in edge_count.items() if count == 1
         )
-        p.communicate()
-        G = nx.Graph()
-        with open(output_path) as f:
-            line = f.readline().rstrip()
-            line = f.readline().rstrip()
-            while line != "0 0":
-                nodes = line.split()
-                G.add_edge(int(nodes[0]) - 1, int(nodes[1]) - 1)
-                line = f.readline().rstrip()
 
-        n = len(G)
-        if n in ns and len(n_to_graphs[n]) < n_instances:
-            print(n)
-            n_to_graphs[n].append(G)
+    return sorted(
+        {
+            tuple(sorted(edge))
+            for u, v, w in triangles
+            for edge in ((u, v), (v, w), (w, u))
+            if edge[0] < n and edge[1] < n
+        }
+    )
+
+
+def generate_planar_graph(n, edge_ratio, rng=random):
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    edges = delaunay_edges(points)
+    rng.shuffle(edges)
+    m = min(math.ceil(edge_ratio * n), len(edges))
+
+    # Keep a random spanning tree of the triangulation and thin out the rest.
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+
+        return i
 
-    return n_to_graphs
+    tree_edges = []
+    other_edges = []
+
+    for u, v in edges:
+        root_u = find(u)
+        root_v = find(v)
+
+        if root_u != root_v:
+            parent[root_u] = root_v
+            tree_edges.append((u, v))
+        else:
+            other_edges.append((u, v))
+
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(tree_edges)
+    G.add_edges_from(other_edges[: max(m - len(tree_edges), 0)])
+
+    return G
+
+
+def generate_instance(
+    n, i, edge_ratio, node_min, node_max, edge_min, edge_max, seed, filepath
+):
+    # Seeding by the instance parameters makes instances independent of each other.
+    rng = random.Random("{} planar {} {}".format(seed, n, i))
+    G = generate_planar_graph(n, edge_ratio, rng=rng)
+    generate_instances.generate_weights(
+        G, node_min, node_max, edge_min, edge_max, rng=rng
+    )
+    generate_instances.write_to_file(G, filepath)
+
+    return filepath
 
 
 if __name__ == "__main__":
@@ -42,37 +117,41 @@ if __name__ == "__main__":
     parser.add_argument("--seed", type=int, default=2022)
     parser.add_argument("--n-instances", type=int, default=20)
     parser.add_argument("--ns", type=int, nargs="+", default=[20, 30, 40])
+    parser.add_argument("--edge-ratio", type=float, default=2.0)
     parser.add_argument("--node-min", type=int, default=2)
     parser.add_argument("--node-max", type=int, default=10)
     parser.add_argument("--edge-min", type=int, default=1)
     parser.add_argument("--edge-max", type=int, default=4)
-    parser.add_argument(
-        "--output-path", type=str, default="BoltzmannPlanarGraphs/ListEdges.txt"
-    )
-    parser.add_argument(
-        "--command",
-        type=str,
-        default="cd BoltzmannPlanarGraphs/build/classes && echo 1000"
-        + " | java boltzmannplanargraphs.Main && cd ../../../",
-    )
+    parser.add_argument("--workers", "-w", type=int, default=None)
     args = parser.parse_args()
 
-    random.seed(args.seed)
     os.makedirs(args.output_dir, exist_ok=True)
-
-    n_to_graphs = generate_planner_graphs(
-        args.n_instances, args.ns, args.command, args.output_path
-    )
+    filepaths = []
 
     for n in args.ns:
         dirname = "planar_n{}".format(n)
         dirpath = os.path.join(args.output_dir, dirname)
         os.makedirs(dirpath, exist_ok=True)
-        for i in range(args.n_instances):
-            G = n_to_graphs[n][i]
-            generate_instances.generate_weights(
-                G, args.node_min, args.node_max, args.edge_min, args.edge_max
+        for i in range(1, args.n_instances + 1):
+            filename = "seed{}_{}".format(args.seed, i)
+            filepaths.append((n, i, os.path.join(dirpath, filename)))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(
+                generate_instance,
+                n,
+                i,
+                args.edge_ratio,
+                args.node_min,
+                args.node_max,
+                args.edge_min,
+                args.edge_max,
+                args.seed,
+                filepath,
             )
-            filename = "seed{}_{}".format(args.seed, i + 1)
-            filepath = os.path.join(dirpath, filename)
-            generate_instances.write_to_file(G, filepath)
+            for n, i, filepath in filepaths
+        ]
+
+        for future in futures:
+            print(future.result())
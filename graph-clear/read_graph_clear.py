@@ -1,16 +1,40 @@
 def read(filename):
     with open(filename) as f:
-        line = f.readline().rstrip().split()
-        n = int(line[0])
-        line = f.readline().rstrip().split()
-        node_weights = [int(i) for i in line]
-        edge_weights = {}
-        for i in range(n):
-            line = [int(w) for w in f.readline().rstrip().split()]
-            for j, w in enumerate(line):
-                if j > i and w > 0:
-                    edge_weights[i, j] = w
-        return n, node_weights, edge_weights
+        n = int(f.readline().split()[0])
+        tokens = f.read().split()
+
+    node_weights = [int(w) for w in tokens[:n]]
+    edge_weights = {}
+
+    # Only the upper triangle is read, and "0" entries are skipped unparsed.
+    for i in range(n):
+        start = n + i * n
+
+        for j, w in enumerate(tokens[start + i + 1 : start + n], i + 1):
+            if w != "0" and int(w) > 0:
+                edge_weights[i, j] = int(w)
+
+    return n, node_weights, edge_weights
+
+
+def compute_equivalence_classes(n, node_weights, edge_weights):
+    rows = [[0] * n for _ in range(n)]
+
+    for (i, j), w in edge_weights.items():
+        rows[i][j] = w
+        rows[j][i] = w
+
+    key_to_class = {}
+
+    for i in range(n):
+        # Non-adjacent twins have the same row, and adjacent twins connected by an
+        # edge of weight w have the same row once the diagonal is set to w.
+        for w in {0} | set(rows[i]):
+            row = list(rows[i])
+            row[i] = w
+            key_to_class.setdefault((node_weights[i], tuple(row)), []).append(i)
+
+    return sorted(c for c in key_to_class.values() if len(c) > 1)
 
 
 def validate(n, node_weights, edge_weights, solution, cost):
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 
 import argparse
+import math
 import time
 
 import didppy as dp
 import read_tsplib
 from mpdtsp_util import (
-    check_edge,
+    compute_edge_loads,
     compute_not_inferred_precedence,
     compute_precedence,
     compute_predecessors_and_successors,
@@ -37,7 +38,56 @@ def compute_min_distance_from(nodes, edges):
     return result
 
 
-def create_model(n, nodes, edges, capacity, items, demand):
+def compute_shortest_distance(nodes, edges):
+    shortest_distance = [
+        [0 if i == j else edges[i, j] if (i, j) in edges else math.inf for j in nodes]
+        for i in nodes
+    ]
+
+    for k in range(len(nodes)):
+        row_k = shortest_distance[k]
+
+        for i in range(len(nodes)):
+            d_ik = shortest_distance[i][k]
+
+            if d_ik < math.inf:
+                shortest_distance[i] = [
+                    d_ij if d_ij <= d_ik + d_kj else d_ik + d_kj
+                    for d_ij, d_kj in zip(shortest_distance[i], row_k)
+                ]
+
+    return shortest_distance
+
+
+def compute_precedence_chain_bound(nodes, successors, shortest_distance):
+    index = {i: k for k, i in enumerate(nodes)}
+    chain = {}
+
+    # A successor has strictly fewer successors, so it is processed first.
+    for i in sorted(nodes, key=lambda i: len(successors[i])):
+        k = index[i]
+        chain[i] = max(
+            [shortest_distance[k][-1]]
+            + [shortest_distance[k][index[j]] + chain[j] for j in successors[i]]
+        )
+
+    # The tour from the current location must reach an unvisited node and then
+    # visit its successors in order before returning to the depot.
+    result = []
+
+    for k in range(len(nodes)):
+        row = []
+
+        for i in nodes:
+            d = shortest_distance[k][index[i]] + chain[i]
+            row.append(0 if d == math.inf else d)
+
+        result.append(row)
+
+    return result
+
+
+def create_model(n, nodes, edges, capacity, items, demand, chain_bound=False):
     precedence_edges = compute_precedence(nodes, items, demand)
     (
         predecessors,
@@ -47,12 +97,13 @@ def create_model(n, nodes, edges, capacity, items, demand):
     not_inferred_precedence_edges = compute_not_inferred_precedence(
         predecessors, successors, precedence_edges
     )
+    edge_loads = compute_edge_loads(edges, nodes, not_inferred_precedence_edges)
     filtered_edges = {
         (i, j): w
         for (i, j), w in edges.items()
         if w >= 0
         and i != j
-        and check_edge(i, j, nodes, not_inferred_precedence_edges, capacity)
+        and edge_loads[i, j] <= capacity
         and (j, i) not in transitive_precedence_edges
         and (
             (i, j) not in transitive_precedence_edges
@@ -133,6 +184,17 @@ def create_model(n, nodes, edges, capacity, items, demand):
     min_distance_from = model.add_int_table(min_distance_from)
     model.add_dual_bound(min_distance_from[unvisited] + min_distance_from[location])
 
+    if chain_bound:
+        shortest_distance = compute_shortest_distance(nodes, filtered_edges)
+        precedence_chain_bound = model.add_int_table(
+            compute_precedence_chain_bound(nodes, successors, shortest_distance)
+        )
+        model.add_dual_bound(
+            unvisited.is_empty().if_then_else(
+                0, precedence_chain_bound.max(location, unvisited)
+            )
+        )
+
     return model, name_to_node
 
 
@@ -242,11 +304,14 @@ if __name__ == "__main__":
     parser.add_argument("--threads", default=1, type=int)
     parser.add_argument("--initial-beam-size", default=1, type=int)
     parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--chain-bound", action="store_true")
     args = parser.parse_args()
 
     n, nodes, edges, capacity, m, items, demand, _ = read_tsplib.read_mpdtsp(args.input)
 
-    model, name_to_node = create_model(n, nodes, edges, capacity, items, demand)
+    model, name_to_node = create_model(
+        n, nodes, edges, capacity, items, demand, chain_bound=args.chain_bound
+    )
 
     if model is None:
         print("The problem is infeasible.")
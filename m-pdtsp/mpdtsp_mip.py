@@ -10,7 +10,7 @@ import read_tsplib
 from mpdtsp_util import (
     compute_precedence,
     compute_predecessors_and_successors,
-    check_edge,
+    compute_edge_loads,
     compute_not_inferred_precedence,
 )
 
@@ -39,6 +39,8 @@ def check_flow(
     predecessors,
     successors,
     not_inferred_precedence_edges,
+    edge_load,
+    capacity,
 ):
     if (
         i in predecessors[p] | successors[q]
@@ -53,47 +55,7 @@ def check_flow(
         or i in (predecessors[p] | predecessors[q] | successors[p] | successors[q])
         or j in (p, q)
         or j in (predecessors[p] | predecessors[q] | successors[p] | successors[q])
-        or (
-            (
-                sum(
-                    not_inferred_precedence_edges[r, s]
-                    for r in nodes
-                    for s in (i, j)
-                    if (r, s) in not_inferred_precedence_edges and r not in (i, j)
-                )
-                + not_inferred_precedence_edges[p, q]
-                <= capacity
-            )
-            and (
-                sum(
-                    not_inferred_precedence_edges[b]
-                    for b in (
-                        {
-                            (i, k)
-                            for k in nodes
-                            if (i, k) in not_inferred_precedence_edges
-                        }
-                        | {
-                            (k, j)
-                            for k in nodes
-                            if (k, j) in not_inferred_precedence_edges
-                        }
-                    )
-                )
-                + not_inferred_precedence_edges[p, q]
-                <= capacity
-            )
-            and (
-                sum(
-                    not_inferred_precedence_edges[r, s]
-                    for r in (i, j)
-                    for s in nodes
-                    if (r, s) in not_inferred_precedence_edges and s not in (i, j)
-                )
-                + not_inferred_precedence_edges[p, q]
-                <= capacity
-            )
-        )
+        or edge_load + not_inferred_precedence_edges[p, q] <= capacity
     )
 
 
@@ -140,11 +102,12 @@ def solve(
         predecessors, successors, precedence_edges
     )
 
+    edge_loads = compute_edge_loads(edges, nodes, not_inferred_precedence_edges)
     filtered_edges = {
         (i, j): w
         for (i, j), w in edges.items()
         if w >= 0
-        and check_edge(i, j, nodes, not_inferred_precedence_edges, capacity)
+        and edge_loads[i, j] <= capacity
         and (j, i) not in transitive_precedence_edges
         and (
             (i, j) not in transitive_precedence_edges
@@ -206,6 +169,8 @@ def solve(
             predecessors,
             successors,
             not_inferred_precedence_edges,
+            edge_loads[i, j],
+            capacity,
         )
     )
 
@@ -8,7 +8,7 @@ import time
 
 import read_tsplib
 from mpdtsp_util import (
-    check_edge,
+    compute_edge_loads,
     compute_not_inferred_precedence,
     compute_precedence,
     compute_predecessors_and_successors,
@@ -41,12 +41,13 @@ def create_picat_input(n, nodes, edges, capacity, items, demand):
     not_inferred_precedence_edges = compute_not_inferred_precedence(
         predecessors, successors, precedence_edges
     )
+    edge_loads = compute_edge_loads(edges, nodes, not_inferred_precedence_edges)
     filtered_edges = {
         (i, j): w
         for (i, j), w in edges.items()
         if w >= 0
         and i != j
-        and check_edge(i, j, nodes, not_inferred_precedence_edges, capacity)
+        and edge_loads[i, j] <= capacity
         and (j, i) not in transitive_precedence_edges
         and (
             (i, j) not in transitive_precedence_edges
@@ -1,62 +1,121 @@
 def compute_precedence(nodes, items, demand):
     precedence_edges = {}
+    pickups = {i: [k for k in items if demand[i, k] > 0] for i in nodes}
+    deliveries = {k: [j for j in nodes if demand[j, k] < 0] for k in items}
 
     for i in nodes:
         if i != nodes[0] and i != nodes[-1]:
             precedence_edges[nodes[0], i] = 0
             precedence_edges[i, nodes[-1]] = 0
+
+        # The weight of (i, j) is the pickup of the first item delivered at j.
+        weights = {}
+
+        for k in pickups[i]:
+            for j in deliveries[k]:
+                if j != i and j not in weights:
+                    weights[j] = demand[i, k]
+
         for j in nodes:
-            if i != j:
-                for k in items:
-                    if demand[i, k] > 0 and demand[j, k] < 0:
-                        precedence_edges[i, j] = demand[i, k]
-                        break
+            if j in weights:
+                precedence_edges[i, j] = weights[j]
 
     return precedence_edges
 
 
-def visit(i, nodes, precedence_edges, visited, result):
-    if i not in visited:
-        visited.add(i)
-        for j in nodes:
-            if (i, j) in precedence_edges:
-                visit(j, nodes, precedence_edges, visited, result)
-        result.append(i)
+def iterate_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
 
 
 def topological_sort(nodes, precedence_edges):
+    index = {i: k for k, i in enumerate(nodes)}
+    adjacent = [[] for _ in nodes]
+
+    for i, j in precedence_edges:
+        adjacent[index[i]].append(index[j])
+
+    for successors in adjacent:
+        successors.sort()
+
     result = []
-    visited = set()
+    visited = [False] * len(nodes)
 
-    for i in nodes:
-        visit(i, nodes, precedence_edges, visited, result)
+    for k in range(len(nodes)):
+        if visited[k]:
+            continue
+
+        visited[k] = True
+        stack = [(k, iter(adjacent[k]))]
+
+        while stack:
+            i, successors = stack[-1]
+
+            for j in successors:
+                if not visited[j]:
+                    visited[j] = True
+                    stack.append((j, iter(adjacent[j])))
+                    break
+            else:
+                stack.pop()
+                result.append(nodes[i])
 
     return list(reversed(result))
 
 
-def compute_predecessors_and_successors(nodes, precedence_edges):
+def compute_predecessor_and_successor_masks(nodes, precedence_edges):
+    index = {i: k for k, i in enumerate(nodes)}
+    direct_predecessors = [0] * len(nodes)
+    direct_successors = [0] * len(nodes)
+
+    for i, j in precedence_edges:
+        direct_predecessors[index[j]] |= 1 << index[i]
+        direct_successors[index[i]] |= 1 << index[j]
+
     sorted_nodes = topological_sort(nodes, precedence_edges)
-    predecessors = {}
+    predecessors = [0] * len(nodes)
 
     for i in sorted_nodes:
-        predecessors[i] = set()
-        for j in sorted_nodes:
-            if (j, i) in precedence_edges:
-                predecessors[i].add(j)
-                predecessors[i].update(predecessors[j])
+        k = index[i]
+        mask = direct_predecessors[k]
+
+        for j in iterate_bits(direct_predecessors[k]):
+            mask |= predecessors[j]
+
+        predecessors[k] = mask
 
-    successors = {}
+    successors = [0] * len(nodes)
 
     for i in reversed(sorted_nodes):
-        successors[i] = set()
-        for j in reversed(sorted_nodes):
-            if (i, j) in precedence_edges:
-                successors[i].add(j)
-                successors[i].update(successors[j])
-
-    transitive_precedence_edges = {
-        (i, j) for i in nodes for j in nodes if i in predecessors[j]
+        k = index[i]
+        mask = direct_successors[k]
+
+        for j in iterate_bits(direct_successors[k]):
+            mask |= successors[j]
+
+        successors[k] = mask
+
+    return sorted_nodes, predecessors, successors
+
+
+def compute_predecessors_and_successors(nodes, precedence_edges):
+    (
+        sorted_nodes,
+        predecessor_masks,
+        successor_masks,
+    ) = compute_predecessor_and_successor_masks(nodes, precedence_edges)
+    index = {i: k for k, i in enumerate(nodes)}
+    predecessors = {
+        i: {nodes[j] for j in iterate_bits(predecessor_masks[index[i]])}
+        for i in sorted_nodes
     }
+    successors = {
+        i: {nodes[j] for j in iterate_bits(successor_masks[index[i]])}
+        for i in reversed(sorted_nodes)
+    }
+    transitive_precedence_edges = {(j, i) for i in nodes for j in predecessors[i]}
 
     return predecessors, successors, transitive_precedence_edges
 
@@ -90,32 +149,33 @@ def compute_not_inferred_precedence(
     return not_inferred_precedence_edges
 
 
-def check_edge(i, j, nodes, precedence_edges, capacity):
-    return (
-        sum(
-            precedence_edges[p, q]
-            for p in nodes
-            for q in (i, j)
-            if (p, q) in precedence_edges and p not in (i, j)
-        )
-        <= capacity
-        and (
-            sum(
-                precedence_edges[b]
-                for b in (
-                    {(i, k) for k in nodes if (i, k) in precedence_edges}
-                    | {(k, j) for k in nodes if (k, j) in precedence_edges}
-                )
-            )
-            <= capacity
-        )
-        and (
-            sum(
-                precedence_edges[p, q]
-                for p in (i, j)
-                for q in nodes
-                if (p, q) in precedence_edges and q not in (i, j)
-            )
-            <= capacity
-        )
+def compute_precedence_loads(nodes, precedence_edges):
+    inbound = {i: 0 for i in nodes}
+    outbound = {i: 0 for i in nodes}
+
+    for (p, q), d in precedence_edges.items():
+        outbound[p] += d
+        inbound[q] += d
+
+    return inbound, outbound
+
+
+def compute_edge_load(i, j, precedence_edges, inbound, outbound):
+    ij = precedence_edges.get((i, j), 0)
+    ji = precedence_edges.get((j, i), 0)
+
+    # Loads entering {i, j}, carried over (i, j), and leaving {i, j}.
+    return max(
+        inbound[i] + inbound[j] - ij - ji,
+        outbound[i] + inbound[j] - ij,
+        outbound[i] + outbound[j] - ij - ji,
     )
+
+
+def compute_edge_loads(edges, nodes, precedence_edges):
+    inbound, outbound = compute_precedence_loads(nodes, precedence_edges)
+
+    return {
+        (i, j): compute_edge_load(i, j, precedence_edges, inbound, outbound)
+        for i, j in edges
+    }
@@ -1,42 +1,43 @@
 import os
 import argparse
 import random
+from concurrent.futures import ProcessPoolExecutor
 
 import read_tsplib
 
 
 def extract_direct_precedence(n, edges):
-    predecessors = {}
-    successors = {}
+    predecessors = [0] * (n + 1)
+    successors = [0] * (n + 1)
 
     for i in range(2, n):
         for j in range(2, n):
             if edges[i, j] == -1:
-                if i not in predecessors:
-                    predecessors[i] = set()
+                predecessors[i] |= 1 << j
+                successors[j] |= 1 << i
 
-                if j not in successors:
-                    successors[j] = set()
+    direct_precedence = []
 
-                predecessors[i].add(j)
-                successors[j].add(i)
+    for i in range(2, n):
+        mask = predecessors[i]
 
-    direct_precedence = []
+        while mask:
+            lowest = mask & -mask
+            j = lowest.bit_length() - 1
+            mask ^= lowest
 
-    for i in predecessors:
-        for j in predecessors[i]:
-            if successors[j].isdisjoint(predecessors[i]):
+            if successors[j] & predecessors[i] == 0:
                 direct_precedence.append((j, i))
 
     return sorted(direct_precedence)
 
 
-def create_demand(nodes, precedence, max_demand):
+def create_demand(nodes, precedence, max_demand, rng=random):
     demand_dimension = len(precedence)
     demand = {i: [0] * demand_dimension for i in nodes}
 
     for k, (i, j) in enumerate(precedence):
-        d = random.randint(1, max_demand)
+        d = rng.randint(1, max_demand)
         demand[i][k] = d
         demand[j][k] = -d
 
@@ -49,6 +50,33 @@ def generate_demand_lines(nodes, demand_dimension, demand):
     ]
 
 
+def read_sop(filepath):
+    n, nodes, edges, _ = read_tsplib.read_tsp(filepath)
+    direct_precedence = extract_direct_precedence(n, edges)
+
+    with open(filepath) as f:
+        lines = f.readlines()
+
+    return nodes, direct_precedence, lines
+
+
+def write_mpdtsp(problem_name, nodes, direct_precedence, lines, q, d, seed, mpdtsp_dir):
+    # Seeding by the output name makes each instance independent of the others.
+    rng = random.Random("{} {}Q{}max{}".format(seed, problem_name, q, d))
+    demand_dimension, demand = create_demand(nodes, direct_precedence, d, rng=rng)
+    capacity_lines = ["CAPACITY: {}\n".format(q)]
+    demand_lines = generate_demand_lines(nodes, demand_dimension, demand)
+    output_path = os.path.join(mpdtsp_dir, "{}Q{}max{}.tsp".format(problem_name, q, d))
+
+    with open(output_path, "w") as f:
+        f.writelines(lines[:-1])
+        f.writelines(capacity_lines)
+        f.writelines(demand_lines)
+        f.writelines(lines[-1:])
+
+    return output_path
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("sop_dir", help="Directory containing the SOP files")
@@ -73,31 +101,33 @@ if __name__ == "__main__":
         type=int,
         default=2023,
     )
+    parser.add_argument("--workers", "-w", type=int, default=None)
     args = parser.parse_args()
 
-    random.seed(args.seed)
-
-    for filename in os.listdir(args.sop_dir):
-        problem_name, _ = os.path.splitext(filename)
-        filepath = os.path.join(args.sop_dir, filename)
-        n, nodes, edges, _ = read_tsplib.read_tsp(filepath)
-        direct_precedence = extract_direct_precedence(n, edges)
-
-        with open(filepath) as f:
-            lines = f.readlines()
-
-        for d in args.max_demand:
-            for factor in args.capacity:
-                q = d * factor
-                demand_dimension, demand = create_demand(nodes, direct_precedence, d)
-                capacity_lines = ["CAPACITY: {}\n".format(q)]
-                demand_lines = generate_demand_lines(nodes, demand_dimension, demand)
-                output_path = os.path.join(
-                    args.mpdtsp_dir, "{}Q{}max{}.tsp".format(problem_name, q, d)
-                )
-
-                with open(output_path, "w") as f:
-                    f.writelines(lines[:-1])
-                    f.writelines(capacity_lines)
-                    f.writelines(demand_lines)
-                    f.writelines(lines[-1:])
+    filenames = sorted(os.listdir(args.sop_dir))
+    problem_names = [os.path.splitext(filename)[0] for filename in filenames]
+    filepaths = [os.path.join(args.sop_dir, filename) for filename in filenames]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        sop_instances = list(executor.map(read_sop, filepaths))
+        futures = [
+            executor.submit(
+                write_mpdtsp,
+                problem_name,
+                nodes,
+                direct_precedence,
+                lines,
+                d * factor,
+                d,
+                args.seed,
+                args.mpdtsp_dir,
+            )
+            for problem_name, (nodes, direct_precedence, lines) in zip(
+                problem_names, sop_instances
+            )
+            for d in args.max_demand
+            for factor in args.capacity
+        ]
+
+        for future in futures:
+            print(future.result())
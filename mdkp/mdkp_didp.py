@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import time
+
+import didppy as dp
+import read_mdkp
+
+start = time.perf_counter()
+
+
+def sort_items_by_efficiency(n, m, profit, weight, capacity):
+    def efficiency(j):
+        normalized_weight = sum(
+            weight[i][j] / capacity[i] for i in range(m) if capacity[i] > 0
+        )
+
+        if normalized_weight > 0:
+            return profit[j] / normalized_weight
+        else:
+            return math.inf
+
+    return sorted(range(n), key=efficiency, reverse=True)
+
+
+def compute_max_efficiency(n, profit, weight, total_profit, epsilon=1e-6):
+    max_efficiency = [0] * (n + 1)
+
+    for j in reversed(range(n)):
+        if weight[j] > 0:
+            efficiency = profit[j] / weight[j] + epsilon
+        else:
+            efficiency = total_profit[j]
+
+        max_efficiency[j] = max(efficiency, max_efficiency[j + 1])
+
+    return max_efficiency
+
+
+def create_model(n, m, profit, weight, capacity, epsilon=1e-6, blind=False):
+    order = sort_items_by_efficiency(n, m, profit, weight, capacity)
+    profit = [profit[j] for j in order] + [0]
+    weight = [[weight[i][j] for j in order] + [0] for i in range(m)]
+
+    model = dp.Model(maximize=True)
+
+    item = model.add_object_type(number=n + 1)
+    j = model.add_element_var(object_type=item, target=0)
+    r = [
+        model.add_int_resource_var(target=capacity[i], less_is_better=False)
+        for i in range(m)
+    ]
+
+    profit_table = model.add_int_table(profit)
+    weight_tables = [model.add_int_table(weight[i]) for i in range(m)]
+
+    model.add_base_case([j == n])
+
+    pack = dp.Transition(
+        name="pack",
+        cost=profit_table[j] + dp.IntExpr.state_cost(),
+        effects=[(j, j + 1)] + [(r[i], r[i] - weight_tables[i][j]) for i in range(m)],
+        preconditions=[r[i] >= weight_tables[i][j] for i in range(m)],
+    )
+    model.add_transition(pack)
+
+    ignore = dp.Transition(
+        name="ignore",
+        cost=dp.IntExpr.state_cost(),
+        effects=[(j, j + 1)],
+    )
+    model.add_transition(ignore)
+
+    if not blind:
+        total_profit = [0] * (n + 1)
+
+        for k in reversed(range(n)):
+            total_profit[k] = profit[k] + total_profit[k + 1]
+
+        total_profit_table = model.add_int_table(total_profit)
+        model.add_dual_bound(total_profit_table[j])
+
+        for i in range(m):
+            max_efficiency = compute_max_efficiency(
+                n, profit, weight[i], total_profit, epsilon=epsilon
+            )
+            max_efficiency_table = model.add_float_table(max_efficiency)
+            model.add_dual_bound(math.floor(max_efficiency_table[j] * dp.max(r[i], 1)))
+
+    return model, order
+
+
+def solve(
+    model,
+    order,
+    solver_name,
+    history,
+    time_limit=None,
+    seed=2023,
+    initial_beam_size=1,
+    threads=1,
+    parallel_type=0,
+):
+    if solver_name == "LNBS":
+        if parallel_type == 2:
+            parallelization_method = dp.BeamParallelizationMethod.Sbs
+        elif parallel_type == 1:
+            parallelization_method = dp.BeamParallelizationMethod.Hdbs1
+        else:
+            parallelization_method = dp.BeamParallelizationMethod.Hdbs2
+
+        solver = dp.LNBS(
+            model,
+            initial_beam_size=initial_beam_size,
+            seed=seed,
+            parallelization_method=parallelization_method,
+            threads=threads,
+            time_limit=time_limit,
+            quiet=False,
+        )
+    elif solver_name == "DD-LNS":
+        solver = dp.DDLNS(model, time_limit=time_limit, quiet=False, seed=seed)
+    elif solver_name == "FR":
+        solver = dp.ForwardRecursion(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "BrFS":
+        solver = dp.BreadthFirstSearch(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "CAASDy":
+        solver = dp.CAASDy(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "DFBB":
+        solver = dp.DFBB(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "CBFS":
+        solver = dp.CBFS(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "ACPS":
+        solver = dp.ACPS(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "APPS":
+        solver = dp.APPS(model, time_limit=time_limit, quiet=False)
+    elif solver_name == "DBDFS":
+        solver = dp.DBDFS(model, time_limit=time_limit, quiet=False)
+    else:
+        if parallel_type == 2:
+            parallelization_method = dp.BeamParallelizationMethod.Sbs
+        elif parallel_type == 1:
+            parallelization_method = dp.BeamParallelizationMethod.Hdbs1
+        else:
+            parallelization_method = dp.BeamParallelizationMethod.Hdbs2
+
+        solver = dp.CABS(
+            model,
+            initial_beam_size=initial_beam_size,
+            threads=threads,
+            parallelization_method=parallelization_method,
+            time_limit=time_limit,
+            quiet=False,
+        )
+
+    if solver_name == "FR":
+        solution = solver.search()
+    else:
+        with open(history, "w") as f:
+            is_terminated = False
+
+            while not is_terminated:
+                solution, is_terminated = solver.search_next()
+
+                if solution.cost is not None:
+                    f.write(
+                        "{}, {}\n".format(time.perf_counter() - start, solution.cost)
+                    )
+                    f.flush()
+
+    print("Search time: {}s".format(solution.time))
+    print("Expanded: {}".format(solution.expanded))
+    print("Generated: {}".format(solution.generated))
+
+    if solution.is_infeasible:
+        return None, None, None, False, True
+    else:
+        packed = []
+
+        for k, t in enumerate(solution.transitions):
+            if t.name == "pack":
+                packed.append(order[k])
+
+        return (
+            sorted(packed),
+            solution.cost,
+            solution.best_bound,
+            solution.is_optimal,
+            False,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", type=str)
+    parser.add_argument("--time-out", default=1800, type=int)
+    parser.add_argument("--history", default="history.csv", type=str)
+    parser.add_argument("--config", default="CABS", type=str)
+    parser.add_argument("--seed", default=2023, type=int)
+    parser.add_argument("--threads", default=1, type=int)
+    parser.add_argument("--initial-beam-size", default=1, type=int)
+    parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--epsilon", type=float, default=1e-6)
+    parser.add_argument("--blind", action="store_true")
+    args = parser.parse_args()
+
+    n, m, profit, weight, capacity = read_mdkp.read_mdkp(args.input)
+    model, order = create_model(
+        n, m, profit, weight, capacity, epsilon=args.epsilon, blind=args.blind
+    )
+    solution, cost, bound, is_optimal, is_infeasible = solve(
+        model,
+        order,
+        args.config,
+        args.history,
+        time_limit=args.time_out,
+        seed=args.seed,
+        threads=args.threads,
+        initial_beam_size=args.initial_beam_size,
+        parallel_type=args.parallel_type,
+    )
+
+    if is_infeasible:
+        print("The problem is infeasible.")
+    else:
+        print("best bound: {}".format(bound))
+
+        if cost is not None:
+            print(solution)
+            print("cost: {}".format(cost))
+
+            if is_optimal:
+                print("optimal cost: {}".format(cost))
+
+            validation_result = read_mdkp.validate_mdkp(
+                m, profit, weight, capacity, solution, cost
+            )
+
+            if validation_result:
+                print("The solution is valid.")
+            else:
+                print("The solution is invalid.")
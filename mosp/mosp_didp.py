@@ -9,44 +9,80 @@ import read_mosp
 start = time.perf_counter()
 
 
-def create_model(item_to_patterns, pattern_to_items):
-    m = len(item_to_patterns)
-    item_to_neighbors = read_mosp.compute_item_to_neighbors(
-        item_to_patterns, pattern_to_items
+def create_model(item_to_patterns, pattern_to_items, pattern_bound=False):
+    (
+        merged_item_to_patterns,
+        merged_pattern_to_items,
+        merged_item_to_items,
+    ) = read_mosp.merge_identical_items(item_to_patterns, pattern_to_items)
+    m = len(merged_item_to_patterns)
+    item_to_neighbor_masks = read_mosp.compute_item_to_neighbor_masks(
+        merged_item_to_patterns, merged_pattern_to_items
     )
+    item_to_neighbors = [
+        list(read_mosp.iterate_bits(mask)) for mask in item_to_neighbor_masks
+    ]
+    item_to_dominated = [
+        list(read_mosp.iterate_bits(mask))
+        for mask in read_mosp.compute_dominated_items(item_to_neighbor_masks)
+    ]
 
     model = dp.Model()
     item = model.add_object_type(m)
     remaining = model.add_set_var(item, [i for i in range(m)])
     opened = model.add_set_var(item, [])
     neighbors = model.add_set_table(item_to_neighbors, object_type=item)
+    dominated = model.add_set_table(item_to_dominated, object_type=item)
+    weight = model.add_int_table([len(items) for items in merged_item_to_items])
 
     model.add_base_case([remaining.is_empty()])
 
-    name_to_item = {}
+    name_to_items = {}
 
     for i in range(m):
         name = "close {}".format(i)
-        name_to_item[name] = i
+        name_to_items[name] = merged_item_to_items[i]
         t = dp.Transition(
             name=name,
             cost=dp.max(
                 dp.IntExpr.state_cost(),
-                ((opened & remaining) | (neighbors[i] - opened)).len(),
+                weight[(opened & remaining) | (neighbors[i] - opened)],
             ),
             effects=[(remaining, remaining.remove(i)), (opened, opened | neighbors[i])],
-            preconditions=[remaining.contains(i)],
+            preconditions=[
+                remaining.contains(i),
+                (remaining & dominated[i]).is_empty(),
+            ],
         )
         model.add_transition(t)
 
-    model.add_dual_bound(0)
+    if pattern_bound:
+        # Items that are open now stay open until the next transition, and all
+        # items of a pattern that is not produced yet are open at the same time.
+        item_sets = sorted(
+            {tuple(items) for items in merged_pattern_to_items if len(items) > 0}
+        )
+        pattern_items = model.add_set_table(item_sets, object_type=item)
+        bound = weight[opened & remaining]
+
+        for k, items in enumerate(item_sets):
+            bound = dp.max(
+                bound,
+                pattern_items[k]
+                .issubset(remaining)
+                .if_then_else(sum(len(merged_item_to_items[i]) for i in items), 0),
+            )
+
+        model.add_dual_bound(bound)
+    else:
+        model.add_dual_bound(0)
 
-    return model, name_to_item
+    return model, name_to_items
 
 
 def solve(
     model,
-    name_to_item,
+    name_to_items,
     solver_name,
     history,
     time_limit=None,
@@ -148,19 +184,13 @@ def solve(
     if solution.is_infeasible:
         return None, None, None, False, True
     else:
-        pattern_sequence = []
-        produced = set()
+        item_order = []
 
         for t in solution.transitions:
-            item = name_to_item[t.name]
-
-            for pattern in item_to_patterns[item]:
-                if pattern not in produced:
-                    pattern_sequence.append(pattern)
-                    produced.add(pattern)
+            item_order += name_to_items[t.name]
 
         return (
-            pattern_sequence,
+            item_order,
             solution.cost,
             solution.best_bound,
             solution.is_optimal,
@@ -178,13 +208,16 @@ if __name__ == "__main__":
     parser.add_argument("--threads", default=1, type=int)
     parser.add_argument("--initial-beam-size", default=1, type=int)
     parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--pattern-bound", action="store_true")
     args = parser.parse_args()
 
     item_to_patterns, pattern_to_items = read_mosp.read(args.input)
-    model, name_to_item = create_model(item_to_patterns, pattern_to_items)
-    solution, cost, bound, is_optimal, is_infeasible = solve(
+    model, name_to_items = create_model(
+        item_to_patterns, pattern_to_items, pattern_bound=args.pattern_bound
+    )
+    item_order, cost, bound, is_optimal, is_infeasible = solve(
         model,
-        name_to_item,
+        name_to_items,
         args.config,
         args.history,
         time_limit=args.time_out,
@@ -200,6 +233,9 @@ if __name__ == "__main__":
         print("best bound: {}".format(bound))
 
         if cost is not None:
+            solution = read_mosp.item_order_to_pattern_order(
+                item_to_patterns, item_order
+            )
             print(" ".join(map(str, solution)))
             print("cost: {}".format(cost))
 
@@ -18,15 +18,71 @@ def read(input_file):
     return item_to_patterns, pattern_to_items
 
 
+def iterate_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def compute_item_to_neighbor_masks(item_to_patterns, pattern_to_items):
+    pattern_to_item_mask = [sum(1 << i for i in items) for items in pattern_to_items]
+    item_to_neighbor_masks = []
+
+    for i, patterns in enumerate(item_to_patterns):
+        mask = 1 << i
+
+        for j in patterns:
+            mask |= pattern_to_item_mask[j]
+
+        item_to_neighbor_masks.append(mask)
+
+    return item_to_neighbor_masks
+
+
 def compute_item_to_neighbors(item_to_patterns, pattern_to_items):
-    m = len(item_to_patterns)
-    item_to_neighbors = [set() for _ in range(m)]
-    for i in range(m):
-        item_to_neighbors[i].add(i)
-        for j in item_to_patterns[i]:
-            for k in pattern_to_items[j]:
-                item_to_neighbors[i].add(k)
-    return item_to_neighbors
+    return [
+        set(iterate_bits(mask))
+        for mask in compute_item_to_neighbor_masks(item_to_patterns, pattern_to_items)
+    ]
+
+
+def merge_identical_items(item_to_patterns, pattern_to_items):
+    patterns_to_merged_item = {}
+    merged_item_to_items = []
+
+    for i, patterns in enumerate(item_to_patterns):
+        key = tuple(patterns)
+
+        if key in patterns_to_merged_item:
+            merged_item_to_items[patterns_to_merged_item[key]].append(i)
+        else:
+            patterns_to_merged_item[key] = len(merged_item_to_items)
+            merged_item_to_items.append([i])
+
+    merged_item_to_patterns = [
+        item_to_patterns[items[0]] for items in merged_item_to_items
+    ]
+    merged_pattern_to_items = [[] for _ in range(len(pattern_to_items))]
+
+    for i, patterns in enumerate(merged_item_to_patterns):
+        for j in patterns:
+            merged_pattern_to_items[j].append(i)
+
+    return merged_item_to_patterns, merged_pattern_to_items, merged_item_to_items
+
+
+def compute_dominated_items(item_to_neighbor_masks):
+    # If the neighbors of item i are a subset of those of item k, some optimal
+    # solution closes i before k.
+    return [
+        sum(
+            1 << i
+            for i, b in enumerate(item_to_neighbor_masks)
+            if i != k and b & ~a == 0 and (a != b or i > k)
+        )
+        for k, a in enumerate(item_to_neighbor_masks)
+    ]
 
 
 def item_order_to_pattern_order(item_to_patterns, items):
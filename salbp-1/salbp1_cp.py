@@ -7,6 +7,14 @@ import time
 import docplex.cp.model as cp
 
 import read_salbp1
+from salbp1_util import (
+    compute_all_followers,
+    compute_all_predecessors,
+    compute_earliest_stations,
+    compute_head_times,
+    compute_m_bounds,
+    compute_tail_times,
+)
 
 
 start = time.perf_counter()
@@ -25,25 +33,14 @@ def solve(
 ):
     tasks = list(range(1, number_of_tasks + 1))
     m_lb, m_ub = compute_m_bounds(number_of_tasks, cycle_time, task_times)
-    all_predecessors, all_predecessors_set = compute_all_predecessors(
-        tasks, predecessors
-    )
-    all_followers, _ = compute_all_followers(tasks, followers)
-
-    e = {
-        i: math.ceil(
-            (task_times[i] + sum(task_times[j] for j in all_predecessors[i]))
-            / cycle_time
-        )
-        for i in tasks
-    }
-    lb = {
-        i: math.floor(
-            (task_times[i] - 1 + sum(task_times[j] for j in all_followers[i]))
-            / cycle_time
-        )
-        for i in tasks
-    }
+    all_predecessors = compute_all_predecessors(tasks, predecessors)
+    all_predecessors_set = {i: set(all_predecessors[i]) for i in tasks}
+    all_followers = compute_all_followers(tasks, followers)
+    head_times = compute_head_times(tasks, task_times, all_predecessors)
+    tail_times = compute_tail_times(tasks, task_times, all_followers)
+
+    e = compute_earliest_stations(tasks, cycle_time, head_times)
+    lb = {i: math.floor((tail_times[i] - 1) / cycle_time) for i in tasks}
     d = {
         (i, j): math.floor(
             (
@@ -143,54 +140,6 @@ def solve(
         print("The problem is infeasible.")
 
 
-def compute_m_bounds(number_of_tasks, cycle_time, task_times):
-    lb = math.ceil(sum(task_times.values()) / cycle_time)
-    ub = min(2 * lb, number_of_tasks)
-    return lb, ub
-
-
-def compute_all_predecessors(tasks, predecessors):
-    all_predecessors = {}
-    all_predecessors_set = {}
-    for i in tasks:
-        predecessor_set = set()
-        for j in predecessors[i]:
-            predecessor_set.add(j)
-            predecessor_set.update(all_predecessors[j])
-        all_predecessors_set[i] = predecessor_set
-        all_predecessors[i] = sorted(list(predecessor_set))
-    return all_predecessors, all_predecessors_set
-
-
-def compute_all_followers(tasks, followers):
-    all_followers = {}
-    all_followers_set = {}
-    for i in reversed(tasks):
-        follower_set = set()
-        for j in followers[i]:
-            follower_set.add(j)
-            follower_set.update(all_followers[j])
-        all_followers_set[i] = follower_set
-        all_followers[i] = sorted(list(follower_set))
-    return all_followers, all_followers_set
-
-
-def compute_earliest_station(i, cycle_time, task_times, predecessors):
-    return math.ceil(
-        (task_times[i] + sum(task_times[j] for j in predecessors[i])) / cycle_time
-    )
-
-
-def compute_latest_station(i, cycle_time, task_times, followers, m):
-    return (
-        m
-        + 1
-        - math.ceil(
-            (task_times[i] + sum(task_times[j] for j in followers[i])) / cycle_time
-        )
-    )
-
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("input", type=str)
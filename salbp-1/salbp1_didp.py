@@ -6,15 +6,35 @@ import time
 
 import didppy as dp
 import read_salbp1
+from salbp1_util import (
+    compute_all_followers,
+    compute_heuristic_solution,
+    compute_latest_stations,
+    compute_m_bounds,
+    compute_tail_times,
+)
 
 start = time.perf_counter()
 
 
-def create_model(number_of_tasks, cycle_time, task_times, predecessors):
+def create_model(
+    number_of_tasks, cycle_time, task_times, predecessors, followers, upper_bound=None
+):
+    tasks = list(range(1, number_of_tasks + 1))
+    _, m_ub = compute_m_bounds(number_of_tasks, cycle_time, task_times)
+
+    if upper_bound is not None:
+        m_ub = min(m_ub, upper_bound)
+
+    all_followers = compute_all_followers(tasks, followers)
+    tail_times = compute_tail_times(tasks, task_times, all_followers)
+    latest = compute_latest_stations(tasks, cycle_time, tail_times, m_ub)
+
     model = dp.Model()
     task = model.add_object_type(number_of_tasks)
     uncompleted = model.add_set_var(task, [i for i in range(number_of_tasks)])
     idle_time = model.add_int_resource_var(0, less_is_better=False)
+    station = model.add_int_resource_var(0, less_is_better=True)
     task_time_table = model.add_int_table(
         [task_times[i + 1] for i in range(number_of_tasks)]
     )
@@ -22,6 +42,11 @@ def create_model(number_of_tasks, cycle_time, task_times, predecessors):
         [[j - 1 for j in predecessors[i + 1]] for i in range(number_of_tasks)],
         object_type=task,
     )
+    followers_table = model.add_set_table(
+        [[j - 1 for j in followers[i + 1]] for i in range(number_of_tasks)],
+        object_type=task,
+    )
+    latest_table = model.add_int_table([latest[i + 1] for i in range(number_of_tasks)])
     lb2_weight1 = model.add_int_table(
         [1 if task_times[i + 1] > cycle_time / 2 else 0 for i in range(number_of_tasks)]
     )
@@ -67,15 +92,20 @@ def create_model(number_of_tasks, cycle_time, task_times, predecessors):
         )
         model.add_transition(t)
 
+    # Tasks whose predecessors are all completed.
+    available = uncompleted - followers_table.union(uncompleted)
+
+    # A new station cannot be opened after the latest station of an uncompleted task.
     t = dp.Transition(
         name="open a new station",
         cost=dp.IntExpr.state_cost() + 1,
-        effects=[(idle_time, cycle_time)],
+        effects=[(idle_time, cycle_time), (station, station + 1)],
         preconditions=[
-            ~uncompleted.contains(i)
-            | (task_time_table[i] > idle_time)
-            | ~uncompleted.isdisjoint(predecessors_table[i])
-            for i in range(number_of_tasks)
+            available.is_empty() | (task_time_table.min(available) > idle_time),
+            station + 1
+            <= uncompleted.is_empty().if_then_else(
+                m_ub, latest_table.min(uncompleted)
+            ),
         ],
     )
     model.add_transition(t, forced=True)
@@ -106,7 +136,13 @@ def solve(
     initial_beam_size=1,
     threads=1,
     parallel_type=0,
+    initial_solution=None,
 ):
+    if initial_solution is None:
+        primal_bound = None
+    else:
+        primal_bound = len(initial_solution)
+
     if solver_name == "LNBS":
         if parallel_type == 2:
             parallelization_method = dp.BeamParallelizationMethod.Sbs
@@ -117,6 +153,7 @@ def solve(
 
         solver = dp.LNBS(
             model,
+            primal_bound=primal_bound,
             initial_beam_size=initial_beam_size,
             seed=seed,
             parallelization_method=parallelization_method,
@@ -125,23 +162,45 @@ def solve(
             quiet=False,
         )
     elif solver_name == "DD-LNS":
-        solver = dp.DDLNS(model, time_limit=time_limit, quiet=False, seed=seed)
+        solver = dp.DDLNS(
+            model,
+            primal_bound=primal_bound,
+            time_limit=time_limit,
+            quiet=False,
+            seed=seed,
+        )
     elif solver_name == "FR":
-        solver = dp.ForwardRecursion(model, time_limit=time_limit, quiet=False)
+        solver = dp.ForwardRecursion(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "BrFS":
-        solver = dp.BreadthFirstSearch(model, time_limit=time_limit, quiet=False)
+        solver = dp.BreadthFirstSearch(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "CAASDy":
-        solver = dp.CAASDy(model, time_limit=time_limit, quiet=False)
+        solver = dp.CAASDy(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "DFBB":
-        solver = dp.DFBB(model, time_limit=time_limit, quiet=False)
+        solver = dp.DFBB(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "CBFS":
-        solver = dp.CBFS(model, time_limit=time_limit, quiet=False)
+        solver = dp.CBFS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "ACPS":
-        solver = dp.ACPS(model, time_limit=time_limit, quiet=False)
+        solver = dp.ACPS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "APPS":
-        solver = dp.APPS(model, time_limit=time_limit, quiet=False)
+        solver = dp.APPS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "DBDFS":
-        solver = dp.DBDFS(model, time_limit=time_limit, quiet=False)
+        solver = dp.DBDFS(
+            model, primal_bound=primal_bound, time_limit=time_limit, quiet=False
+        )
     else:
         if parallel_type == 2:
             parallelization_method = dp.BeamParallelizationMethod.Sbs
@@ -152,6 +211,7 @@ def solve(
 
         solver = dp.CABS(
             model,
+            primal_bound=primal_bound,
             initial_beam_size=initial_beam_size,
             threads=threads,
             parallelization_method=parallelization_method,
@@ -163,6 +223,10 @@ def solve(
         solution = solver.search()
     else:
         with open(history, "w") as f:
+            if initial_solution is not None:
+                f.write("{}, {}\n".format(time.perf_counter() - start, primal_bound))
+                f.flush()
+
             is_terminated = False
 
             while not is_terminated:
@@ -178,6 +242,13 @@ def solve(
     print("Expanded: {}".format(solution.expanded))
     print("Generated: {}".format(solution.generated))
 
+    if solution.cost is None and initial_solution is not None:
+        # No better solution than the initial one exists if the search terminates.
+        if solution.is_optimal or solution.is_infeasible:
+            return initial_solution, primal_bound, primal_bound, True, False
+        else:
+            return initial_solution, primal_bound, solution.best_bound, False, False
+
     if solution.is_infeasible:
         return None, None, None, False, True
     else:
@@ -208,16 +279,37 @@ if __name__ == "__main__":
     parser.add_argument("--threads", default=1, type=int)
     parser.add_argument("--initial-beam-size", default=1, type=int)
     parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--primal-heuristic", action="store_true")
     args = parser.parse_args()
 
-    number_of_tasks, cycle_time, task_times, predecessors, _ = read_salbp1.read(
+    number_of_tasks, cycle_time, task_times, predecessors, followers = read_salbp1.read(
         args.input
     )
+
+    if args.primal_heuristic:
+        initial_solution = compute_heuristic_solution(
+            list(range(1, number_of_tasks + 1)),
+            cycle_time,
+            task_times,
+            predecessors,
+            followers,
+        )
+    else:
+        initial_solution = None
+
+    if initial_solution is None:
+        upper_bound = None
+    else:
+        upper_bound = len(initial_solution)
+        print("initial cost: {}".format(upper_bound))
+
     model, name_to_task = create_model(
         number_of_tasks,
         cycle_time,
         task_times,
         predecessors,
+        followers,
+        upper_bound=upper_bound,
     )
     solution, cost, bound, is_optimal, is_infeasible = solve(
         model,
@@ -229,6 +321,7 @@ if __name__ == "__main__":
         threads=args.threads,
         initial_beam_size=args.initial_beam_size,
         parallel_type=args.parallel_type,
+        initial_solution=initial_solution,
     )
 
     if is_infeasible:
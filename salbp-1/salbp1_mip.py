@@ -6,6 +6,15 @@ import time
 
 import gurobipy as gp
 import read_salbp1
+from salbp1_util import (
+    compute_all_followers,
+    compute_all_predecessors,
+    compute_earliest_stations,
+    compute_head_times,
+    compute_latest_stations,
+    compute_m_bounds,
+    compute_tail_times,
+)
 
 start = time.perf_counter()
 
@@ -40,17 +49,11 @@ def solve(
     stations = list(range(1, m_ub + 1))
     all_predecessors = compute_all_predecessors(tasks, predecessors)
     all_followers = compute_all_followers(tasks, followers)
-    earliest = {}
-    latest = {}
-    x_indices = []
-    for i in tasks:
-        earliest[i] = compute_earliest_station(
-            i, cycle_time, task_times, all_predecessors
-        )
-        latest[i] = compute_latest_station(
-            i, cycle_time, task_times, all_followers, m_ub
-        )
-        x_indices += [(s, i) for s in range(earliest[i], latest[i] + 1)]
+    head_times = compute_head_times(tasks, task_times, all_predecessors)
+    tail_times = compute_tail_times(tasks, task_times, all_followers)
+    earliest = compute_earliest_stations(tasks, cycle_time, head_times)
+    latest = compute_latest_stations(tasks, cycle_time, tail_times, m_ub)
+    x_indices = [(s, i) for i in tasks for s in range(earliest[i], latest[i] + 1)]
 
     model = gp.Model()
     model.setParam("Threads", threads)
@@ -78,7 +81,7 @@ def solve(
             x[u, i]
             for u in stations
             if earliest[i] <= u <= latest[i]
-            and u >= compute_latest_station(i, cycle_time, task_times, all_followers, s)
+            and u >= s + 1 - math.ceil(tail_times[i] / cycle_time)
         )
         <= y[s]
         for s in stations
@@ -136,50 +139,6 @@ def solve(
             print("The solution is invalid.")
 
 
-def compute_m_bounds(number_of_tasks, cycle_time, task_times):
-    lb = math.ceil(sum(task_times.values()) / cycle_time)
-    ub = min(2 * lb, number_of_tasks)
-    return lb, ub
-
-
-def compute_all_predecessors(tasks, predecessors):
-    all_predecessors = {}
-    for i in tasks:
-        predecessor_set = set()
-        for j in predecessors[i]:
-            predecessor_set.add(j)
-            predecessor_set.update(all_predecessors[j])
-        all_predecessors[i] = sorted(list(predecessor_set))
-    return all_predecessors
-
-
-def compute_all_followers(tasks, followers):
-    all_followers = {}
-    for i in reversed(tasks):
-        follower_set = set()
-        for j in followers[i]:
-            follower_set.add(j)
-            follower_set.update(all_followers[j])
-        all_followers[i] = sorted(list(follower_set))
-    return all_followers
-
-
-def compute_earliest_station(i, cycle_time, task_times, predecessors):
-    return math.ceil(
-        (task_times[i] + sum(task_times[j] for j in predecessors[i])) / cycle_time
-    )
-
-
-def compute_latest_station(i, cycle_time, task_times, followers, m):
-    return (
-        m
-        + 1
-        - math.ceil(
-            (task_times[i] + sum(task_times[j] for j in followers[i])) / cycle_time
-        )
-    )
-
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("input", type=str)
@@ -0,0 +1,132 @@
+import math
+
+
+def iterate_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def compute_m_bounds(number_of_tasks, cycle_time, task_times):
+    lb = math.ceil(sum(task_times.values()) / cycle_time)
+    ub = min(2 * lb, number_of_tasks)
+    return lb, ub
+
+
+def compute_all_predecessor_masks(tasks, predecessors):
+    masks = {}
+
+    # Tasks are numbered in a topological order.
+    for i in tasks:
+        mask = 0
+
+        for j in predecessors[i]:
+            mask |= masks[j] | (1 << j)
+
+        masks[i] = mask
+
+    return masks
+
+
+def compute_all_follower_masks(tasks, followers):
+    masks = {}
+
+    for i in reversed(tasks):
+        mask = 0
+
+        for j in followers[i]:
+            mask |= masks[j] | (1 << j)
+
+        masks[i] = mask
+
+    return masks
+
+
+def compute_all_predecessors(tasks, predecessors):
+    masks = compute_all_predecessor_masks(tasks, predecessors)
+
+    return {i: list(iterate_bits(masks[i])) for i in tasks}
+
+
+def compute_all_followers(tasks, followers):
+    masks = compute_all_follower_masks(tasks, followers)
+
+    return {i: list(iterate_bits(masks[i])) for i in tasks}
+
+
+def compute_head_times(tasks, task_times, all_predecessors):
+    return {
+        i: task_times[i] + sum(task_times[j] for j in all_predecessors[i])
+        for i in tasks
+    }
+
+
+def compute_tail_times(tasks, task_times, all_followers):
+    return {
+        i: task_times[i] + sum(task_times[j] for j in all_followers[i]) for i in tasks
+    }
+
+
+def compute_earliest_stations(tasks, cycle_time, head_times):
+    return {i: math.ceil(head_times[i] / cycle_time) for i in tasks}
+
+
+def compute_latest_stations(tasks, cycle_time, tail_times, m):
+    return {i: m + 1 - math.ceil(tail_times[i] / cycle_time) for i in tasks}
+
+
+def compute_station_oriented_solution(
+    tasks, cycle_time, task_times, predecessors, followers, priority
+):
+    n_uncompleted_predecessors = {i: len(predecessors[i]) for i in tasks}
+    available = [i for i in tasks if n_uncompleted_predecessors[i] == 0]
+    solution = []
+    idle_time = 0
+
+    while len(available) > 0:
+        candidates = [i for i in available if task_times[i] <= idle_time]
+
+        if len(candidates) == 0:
+            # A task does not fit into an empty station.
+            if len(solution) > 0 and len(solution[-1]) == 0:
+                return None
+
+            solution.append([])
+            idle_time = cycle_time
+            continue
+
+        i = max(candidates, key=lambda i: (priority[i], -i))
+        solution[-1].append(i)
+        idle_time -= task_times[i]
+        available.remove(i)
+
+        for j in followers[i]:
+            n_uncompleted_predecessors[j] -= 1
+
+            if n_uncompleted_predecessors[j] == 0:
+                available.append(j)
+
+    return solution
+
+
+def compute_heuristic_solution(tasks, cycle_time, task_times, predecessors, followers):
+    all_followers = compute_all_followers(tasks, followers)
+    tail_times = compute_tail_times(tasks, task_times, all_followers)
+    priorities = [
+        tail_times,
+        task_times,
+        {i: len(all_followers[i]) for i in tasks},
+    ]
+    solutions = [
+        compute_station_oriented_solution(
+            tasks, cycle_time, task_times, predecessors, followers, priority
+        )
+        for priority in priorities
+    ]
+    solutions = [solution for solution in solutions if solution is not None]
+
+    if len(solutions) == 0:
+        return None
+
+    return min(solutions, key=len)
@@ -5,24 +5,18 @@ import time
 
 import didppy as dp
 import read_talent_scheduling
+from talent_scheduling_util import (
+    get_subsumption_candidates,
+    improve_solution,
+    simplify,
+)
 
 start = time.perf_counter()
 
 
-def get_subsumption_candidates(players):
-    n = len(players)
-    candidates = [[] for _ in range(n)]
-
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                if set(players[i]) <= set(players[j]):
-                    candidates[i].append(j)
-
-    return candidates
-
-
-def create_model(actor_to_scenes, actor_to_cost, scene_to_duration, base_cost):
+def create_model(
+    actor_to_scenes, actor_to_cost, scene_to_duration, base_cost, waiting_bound=False
+):
     n = len(scene_to_duration)
     m = len(actor_to_scenes)
     scene_list = list(range(n))
@@ -79,7 +73,27 @@ def create_model(actor_to_scenes, actor_to_cost, scene_to_duration, base_cost):
         )
         model.add_transition(shoot)
 
-    model.add_dual_bound(base_cost[remaining])
+    if waiting_bound:
+        # Actors on location and not in the next scene wait during that scene.
+        standby = players.union(remaining) & players.union(remaining.complement())
+        max_waiting_cost = sum(scene_to_duration) * sum(actor_to_cost)
+        next_waiting_cost = max_waiting_cost
+
+        for s in scene_list:
+            next_waiting_cost = dp.min(
+                next_waiting_cost,
+                remaining.contains(s).if_then_else(
+                    scene_to_duration[s] * actor_cost[standby - players[s]],
+                    max_waiting_cost,
+                ),
+            )
+
+        model.add_dual_bound(
+            base_cost[remaining]
+            + remaining.is_empty().if_then_else(0, next_waiting_cost)
+        )
+    else:
+        model.add_dual_bound(base_cost[remaining])
 
     return model, name_to_scene
 
@@ -190,6 +204,8 @@ if __name__ == "__main__":
     parser.add_argument("--threads", default=1, type=int)
     parser.add_argument("--initial-beam-size", default=1, type=int)
     parser.add_argument("--parallel-type", default=0, type=int)
+    parser.add_argument("--waiting-bound", action="store_true")
+    parser.add_argument("--local-search", action="store_true")
     args = parser.parse_args()
 
     (
@@ -204,9 +220,7 @@ if __name__ == "__main__":
         simplified_scene_to_duration,
         single_actor_cost,
         scene_to_original,
-    ) = read_talent_scheduling.simplify(
-        actor_to_scenes, actor_to_cost, scene_to_duration
-    )
+    ) = simplify(actor_to_scenes, actor_to_cost, scene_to_duration)
     base_cost = read_talent_scheduling.compute_base_costs(
         simplified_actor_to_scenes,
         simplified_actor_to_cost,
@@ -218,6 +232,7 @@ if __name__ == "__main__":
         simplified_actor_to_cost,
         simplified_scene_to_duration,
         base_cost,
+        waiting_bound=args.waiting_bound,
     )
     solution, cost, bound, is_optimal, is_infeasible = solve(
         model,
@@ -243,6 +258,21 @@ if __name__ == "__main__":
                 print("optimal cost: {}".format(cost))
 
             if solution is not None:
+                if args.local_search:
+                    solution = improve_solution(
+                        solution,
+                        simplified_actor_to_scenes,
+                        simplified_actor_to_cost,
+                        simplified_scene_to_duration,
+                    )
+                    cost = read_talent_scheduling.compute_solution_cost(
+                        solution,
+                        simplified_actor_to_scenes,
+                        simplified_actor_to_cost,
+                        simplified_scene_to_duration,
+                    )
+                    print("improved cost: {}".format(cost))
+
                 (
                     solution,
                     reconstructed_cost,
@@ -6,6 +6,7 @@ import time
 import gurobipy as gp
 
 import read_talent_scheduling
+from talent_scheduling_util import simplify
 
 
 start = time.perf_counter()
@@ -156,9 +157,7 @@ if __name__ == "__main__":
         simplified_scene_to_duration,
         single_actor_cost,
         scene_to_original,
-    ) = read_talent_scheduling.simplify(
-        actor_to_scenes, actor_to_cost, scene_to_duration
-    )
+    ) = simplify(actor_to_scenes, actor_to_cost, scene_to_duration)
     solution, cost, is_optimal, gap, best_bound = solve(
         simplified_actor_to_scenes,
         simplified_actor_to_cost,
@@ -7,23 +7,11 @@ import subprocess
 import time
 
 import read_talent_scheduling
+from talent_scheduling_util import simplify
 
 start = time.perf_counter()
 
 
-def get_subsumption_candidates(players):
-    n = len(players)
-    candidates = [[] for _ in range(n)]
-
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                if set(players[i]) <= set(players[j]):
-                    candidates[i].append(j)
-
-    return candidates
-
-
 def get_limit_resource(time_limit, memory_limit):
     def limit_resources():
         if time_limit is not None:
@@ -76,9 +64,7 @@ if __name__ == "__main__":
         simplified_scene_to_duration,
         single_actor_cost,
         scene_to_original,
-    ) = read_talent_scheduling.simplify(
-        actor_to_scenes, actor_to_cost, scene_to_duration
-    )
+    ) = simplify(actor_to_scenes, actor_to_cost, scene_to_duration)
 
     problem = create_picat_input(
         simplified_actor_to_scenes,
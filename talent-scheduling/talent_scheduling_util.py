@@ -0,0 +1,298 @@
+def iterate_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def to_masks(rows):
+    return [sum(1 << j for j, v in enumerate(row) if v == 1) for row in rows]
+
+
+def transpose_masks(masks, n):
+    transposed = [0] * n
+
+    for i, mask in enumerate(masks):
+        for j in iterate_bits(mask):
+            transposed[j] |= 1 << i
+
+    return transposed
+
+
+def get_subsumption_candidates(players):
+    masks = [sum(1 << j for j in actors) for actors in players]
+
+    return [
+        [j for j, b in enumerate(masks) if i != j and a & ~b == 0]
+        for i, a in enumerate(masks)
+    ]
+
+
+def eliminate_single_scene_actors(
+    actor_to_scene_mask, actor_to_cost, scene_to_duration
+):
+    single_actor_cost = 0
+    new_actor_to_scene_mask = []
+    new_actor_to_cost = []
+
+    for mask, cost in zip(actor_to_scene_mask, actor_to_cost):
+        if mask & (mask - 1) != 0:
+            new_actor_to_scene_mask.append(mask)
+            new_actor_to_cost.append(cost)
+        elif mask != 0:
+            single_actor_cost += scene_to_duration[mask.bit_length() - 1] * cost
+
+    return new_actor_to_scene_mask, new_actor_to_cost, single_actor_cost
+
+
+def concatenate_duplicate_scenes(actor_to_scene_mask, scene_to_duration):
+    n_scenes = len(scene_to_duration)
+    scene_to_actor_mask = transpose_masks(actor_to_scene_mask, n_scenes)
+    actor_mask_to_new_scene = {}
+    scene_to_new_scene = []
+    new_scene_to_duration = []
+
+    for i, actors in enumerate(scene_to_actor_mask):
+        if actors in actor_mask_to_new_scene:
+            index = actor_mask_to_new_scene[actors]
+            new_scene_to_duration[index] += scene_to_duration[i]
+        else:
+            index = len(new_scene_to_duration)
+            actor_mask_to_new_scene[actors] = index
+            new_scene_to_duration.append(scene_to_duration[i])
+
+        scene_to_new_scene.append(index)
+
+    new_actor_to_scene_mask = transpose_masks(
+        list(actor_mask_to_new_scene), len(actor_to_scene_mask)
+    )
+
+    return new_actor_to_scene_mask, new_scene_to_duration, scene_to_new_scene
+
+
+def simplify(actor_to_scenes, actor_to_cost, scene_to_duration):
+    actor_to_scene_mask = to_masks(actor_to_scenes)
+    single_actor_cost = 0
+    scene_to_original = [[i] for i in range(len(scene_to_duration))]
+
+    while True:
+        (
+            actor_to_scene_mask,
+            actor_to_cost,
+            new_single_actor_cost,
+        ) = eliminate_single_scene_actors(
+            actor_to_scene_mask, actor_to_cost, scene_to_duration
+        )
+        single_actor_cost += new_single_actor_cost
+        n_scenes = len(scene_to_duration)
+        (
+            actor_to_scene_mask,
+            scene_to_duration,
+            scene_to_new_scene,
+        ) = concatenate_duplicate_scenes(actor_to_scene_mask, scene_to_duration)
+
+        # Concatenated scenes are shot consecutively in the original order.
+        new_scene_to_original = [[] for _ in range(len(scene_to_duration))]
+
+        for i, j in enumerate(scene_to_new_scene):
+            new_scene_to_original[j] += scene_to_original[i]
+
+        scene_to_original = new_scene_to_original
+
+        # Merging scenes may turn actors into single-scene actors.
+        if len(scene_to_duration) == n_scenes:
+            break
+
+    simplified_actor_to_scenes = [
+        [(mask >> j) & 1 for j in range(len(scene_to_duration))]
+        for mask in actor_to_scene_mask
+    ]
+
+    return (
+        simplified_actor_to_scenes,
+        actor_to_cost,
+        scene_to_duration,
+        single_actor_cost,
+        scene_to_original,
+    )
+
+
+def compute_actor_positions(solution, actor_to_scenes):
+    return [
+        [i for i, s in enumerate(solution) if scenes[s] == 1]
+        for scenes in actor_to_scenes
+    ]
+
+
+def compute_prefix_durations(solution, scene_to_duration):
+    prefix = [0]
+
+    for s in solution:
+        prefix.append(prefix[-1] + scene_to_duration[s])
+
+    return prefix
+
+
+def compute_new_span(positions, removed, added, position):
+    if removed is None:
+        return position(positions[0]), position(positions[-1])
+
+    # Only the two outermost positions can become the new first or last.
+    rest = [i for i in positions[:2] + positions[-2:] if i != removed]
+
+    if len(rest) == 0:
+        return added, added
+
+    return min(position(rest[0]), added), max(position(rest[-1]), added)
+
+
+def compute_move_delta(
+    solution, p, q, actor_to_scenes, actor_to_cost, scene_to_duration, cache
+):
+    actor_positions, prefix = cache
+    s = solution[p]
+    d = scene_to_duration[s]
+
+    if p < q:
+
+        def position(i):
+            return i - 1 if p < i <= q else i
+
+        def new_prefix(k):
+            return prefix[k + 1] - d if p < k <= q else prefix[k]
+
+    else:
+
+        def position(i):
+            return i + 1 if q <= i < p else i
+
+        def new_prefix(k):
+            return prefix[k - 1] + d if q < k <= p else prefix[k]
+
+    delta = 0
+
+    for positions, scenes, actor_cost in zip(
+        actor_positions, actor_to_scenes, actor_to_cost
+    ):
+        if len(positions) == 0:
+            continue
+
+        if scenes[s] == 1:
+            first, last = compute_new_span(positions, p, q, position)
+        else:
+            first, last = compute_new_span(positions, None, None, position)
+
+        delta += actor_cost * (
+            new_prefix(last + 1)
+            - new_prefix(first)
+            - prefix[positions[-1] + 1]
+            + prefix[positions[0]]
+        )
+
+    return delta
+
+
+def compute_swap_delta(
+    solution, p, q, actor_to_scenes, actor_to_cost, scene_to_duration, cache
+):
+    actor_positions, prefix = cache
+
+    if p > q:
+        p, q = q, p
+
+    s = solution[p]
+    t = solution[q]
+    d = scene_to_duration[t] - scene_to_duration[s]
+
+    def position(i):
+        return i
+
+    def new_prefix(k):
+        return prefix[k] + d if p < k <= q else prefix[k]
+
+    delta = 0
+
+    for positions, scenes, actor_cost in zip(
+        actor_positions, actor_to_scenes, actor_to_cost
+    ):
+        if len(positions) == 0:
+            continue
+
+        if scenes[s] == 1 and scenes[t] == 0:
+            first, last = compute_new_span(positions, p, q, position)
+        elif scenes[s] == 0 and scenes[t] == 1:
+            first, last = compute_new_span(positions, q, p, position)
+        else:
+            first, last = positions[0], positions[-1]
+
+        delta += actor_cost * (
+            new_prefix(last + 1)
+            - new_prefix(first)
+            - prefix[positions[-1] + 1]
+            + prefix[positions[0]]
+        )
+
+    return delta
+
+
+def improve_solution(solution, actor_to_scenes, actor_to_cost, scene_to_duration):
+    solution = list(solution)
+    n = len(solution)
+    cache = (
+        compute_actor_positions(solution, actor_to_scenes),
+        compute_prefix_durations(solution, scene_to_duration),
+    )
+    p = 0
+    n_unimproved = 0
+
+    # Scan positions cyclically and stop after a full pass without improvement.
+    while n_unimproved < n:
+        improved = False
+
+        for q in range(n):
+            if p == q:
+                continue
+
+            if (
+                compute_move_delta(
+                    solution,
+                    p,
+                    q,
+                    actor_to_scenes,
+                    actor_to_cost,
+                    scene_to_duration,
+                    cache,
+                )
+                < 0
+            ):
+                solution.insert(q, solution.pop(p))
+                improved = True
+                break
+
+            if (
+                compute_swap_delta(
+                    solution,
+                    p,
+                    q,
+                    actor_to_scenes,
+                    actor_to_cost,
+                    scene_to_duration,
+                    cache,
+                )
+                < 0
+            ):
+                solution[p], solution[q] = solution[q], solution[p]
+                improved = True
+                break
+
+        if improved:
+            cache = (
+                compute_actor_positions(solution, actor_to_scenes),
+                compute_prefix_durations(solution, scene_to_duration),
+            )
+            n_unimproved = 0
+        else:
+            n_unimproved += 1
+            p = (p + 1) % n
+
+    return solution
@@ -1,7 +1,3 @@
-import copy
-from collections import deque
-
-
 def read_wt(filename):
     processing_times = []
     due_dates = []
@@ -187,10 +183,120 @@ def verify_wet(
     return True
 
 
+def iterate_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def sum_bits(mask, values):
+    return sum(values[k] for k in iterate_bits(mask))
+
+
+def initialize_precedence_state(processing_times, before, after):
+    return {
+        "before": [set(b) for b in before],
+        "after": [set(a) for a in after],
+        "before_masks": [sum(1 << k for k in b) for b in before],
+        "after_masks": [sum(1 << k for k in a) for a in after],
+        "before_sums": [sum(processing_times[k] for k in b) for b in before],
+        "after_sums": [sum(processing_times[k] for k in a) for a in after],
+        # Transitive closure of the precedence as bitsets.
+        "descendants": [0 for _ in processing_times],
+        "ancestors": [0 for _ in processing_times],
+    }
+
+
+def add_arc(i, j, processing_times, state):
+    state["before"][j].add(i)
+    state["after"][i].add(j)
+    state["before_masks"][j] |= 1 << i
+    state["after_masks"][i] |= 1 << j
+    state["before_sums"][j] += processing_times[i]
+    state["after_sums"][i] += processing_times[j]
+
+
+def remove_arc(i, j, processing_times, state):
+    state["before"][j].remove(i)
+    state["after"][i].remove(j)
+    state["before_masks"][j] ^= 1 << i
+    state["after_masks"][i] ^= 1 << j
+    state["before_sums"][j] -= processing_times[i]
+    state["after_sums"][i] -= processing_times[j]
+
+
+def add_to_closure(i, j, state):
+    sources = state["ancestors"][i] | (1 << i)
+    targets = state["descendants"][j] | (1 << j)
+
+    for k in iterate_bits(sources):
+        state["descendants"][k] |= targets
+
+    for k in iterate_bits(targets):
+        state["ancestors"][k] |= sources
+
+
+def has_path(i, j, state):
+    return (state["descendants"][i] >> j) & 1 == 1
+
+
+def update_longest_paths(i, j, path_length, state):
+    # A new longest path from k to l goes through the new arc (i, j).
+    targets = list(iterate_bits(state["descendants"][j] | (1 << j)))
+
+    for k in iterate_bits(state["ancestors"][i] | (1 << i)):
+        for l in targets:
+            length = path_length[k][i] + 1 + path_length[j][l]
+
+            if length > path_length[k][l]:
+                path_length[k][l] = length
+
+
+def check_kanet_conditions_for_state(
+    i, j, processing_times, due_dates, weights, total_processing_time, state
+):
+    before_masks = state["before_masks"]
+    after_masks = state["after_masks"]
+    before_sums = state["before_sums"]
+    after_sums = state["after_sums"]
+    p_common = (
+        before_sums[i]
+        + before_sums[j]
+        - sum_bits(before_masks[i] & before_masks[j], processing_times)
+        + processing_times[i]
+        + processing_times[j]
+    )
+    p_a_i_bar = total_processing_time - after_sums[i]
+    p_a_bar_common = (
+        p_a_i_bar
+        - after_sums[j]
+        + sum_bits(after_masks[i] & after_masks[j], processing_times)
+    )
+
+    return check_kanet_conditions(
+        i,
+        j,
+        processing_times,
+        due_dates,
+        weights,
+        before_sums[j],
+        p_common,
+        p_a_i_bar,
+        p_a_bar_common,
+    )
+
+
 def extract_precedence_for_wt(processing_times, due_dates, weights):
     jobs = list(range(len(processing_times)))
-    before = [set() for _ in jobs]
-    after = [set() for _ in jobs]
+    total_processing_time = sum(processing_times)
+    state = initialize_precedence_state(
+        processing_times, [set() for _ in jobs], [set() for _ in jobs]
+    )
+    # The conditions for (i, j) depend only on the sets of i and j, so a failed
+    # pair is checked again only after one of them changes.
+    versions = [0 for _ in jobs]
+    failed = {}
     change = True
 
     while change:
@@ -198,127 +304,118 @@ def extract_precedence_for_wt(processing_times, due_dates, weights):
         for i in jobs:
             for j in jobs:
                 if (
-                    i != j
-                    and i not in before[j]
-                    and not has_path(j, i, after)
-                    and check_kanet_conditions(
-                        i, j, processing_times, due_dates, weights, before, after
-                    )
+                    i == j
+                    or i in state["before"][j]
+                    or has_path(j, i, state)
+                    or failed.get((i, j)) == (versions[i], versions[j])
+                ):
+                    continue
+
+                if check_kanet_conditions_for_state(
+                    i,
+                    j,
+                    processing_times,
+                    due_dates,
+                    weights,
+                    total_processing_time,
+                    state,
                 ):
-                    before[j].add(i)
-                    after[i].add(j)
+                    add_arc(i, j, processing_times, state)
+                    add_to_closure(i, j, state)
+                    versions[i] += 1
+                    versions[j] += 1
                     change = True
+                else:
+                    failed[i, j] = (versions[i], versions[j])
 
-    return before, after
+    return state["before"], state["after"]
 
 
 def extract_precedence_for_wt_prec(processing_times, due_dates, weights, before, after):
     jobs = list(range(len(processing_times)))
-    new_before = copy.deepcopy(before)
-    new_after = copy.deepcopy(after)
+    total_processing_time = sum(processing_times)
+    state = initialize_precedence_state(processing_times, before, after)
+    # The number of arcs on the longest path, or 0 if there is no path.
+    path_length = [[0 for _ in jobs] for _ in jobs]
+
+    for i in jobs:
+        for j in after[i]:
+            update_longest_paths(i, j, path_length, state)
+            add_to_closure(i, j, state)
+
     change = True
 
     while change:
         change = False
         for i in jobs:
             for j in jobs:
-                if i != j and i not in new_before[j] and not has_path(j, i, new_after):
-                    tmp_before = copy.deepcopy(new_before)
-                    tmp_before[j].add(i)
-                    path_length = compute_longest_path(jobs, tmp_before)
-                    gamma = [
-                        (path_length[k, l], (k, l))
-                        for k in (before[i] - new_before[j]) | set([i])
-                        for l in (after[j] - new_after[i]) | set([j])
-                    ]
-                    pairs = [(k, l) for _, (k, l) in sorted(gamma, reverse=True)]
-                    tmp_before, tmp_after = frame1(
-                        pairs,
+                if i == j or i in state["before"][j] or has_path(j, i, state):
+                    continue
+
+                # Longest paths after adding (i, j) without modifying the graph.
+                gamma = [
+                    (
+                        max(
+                            path_length[k][l],
+                            path_length[k][i] + 1 + path_length[j][l],
+                        ),
+                        (k, l),
+                    )
+                    for k in (before[i] - state["before"][j]) | set([i])
+                    for l in (after[j] - state["after"][i]) | set([j])
+                ]
+                pairs = [(k, l) for _, (k, l) in sorted(gamma, reverse=True)]
+                added = []
+                success = True
+
+                for k, l in pairs:
+                    if not check_kanet_conditions_for_state(
+                        k,
+                        l,
                         processing_times,
                         due_dates,
                         weights,
-                        new_before,
-                        new_after,
-                    )
-
-                    if tmp_before is not None:
-                        change = True
-                        new_before = tmp_before
-                        new_after = tmp_after
-
-    return new_before, new_after
-
-
-def has_path(i, j, after):
-    open = deque([i])
-    checked = set()
-
-    while len(open) > 0:
-        u = open.popleft()
-
-        for v in after[u]:
-            if v == j:
-                return True
-
-            if v not in checked:
-                checked.add(v)
-                open.append(v)
-
-    return False
-
-
-def compute_longest_path(jobs, before):
-    d = {}
-
-    for i in jobs:
-        for j in jobs:
-            if i in before[j]:
-                d[i, j] = -1
-            else:
-                d[i, j] = 0
-
-    for k in jobs:
-        for i in jobs:
-            for j in jobs:
-                if d[i, j] > d[i, k] + d[k, j]:
-                    d[i, j] = d[i, k] + d[k, j]
+                        total_processing_time,
+                        state,
+                    ):
+                        success = False
+                        break
 
-    return {k: -v for k, v in d.items()}
+                    if k not in state["before"][l]:
+                        add_arc(k, l, processing_times, state)
+                        added.append((k, l))
 
+                if success:
+                    for k, l in added:
+                        update_longest_paths(k, l, path_length, state)
+                        add_to_closure(k, l, state)
 
-def frame1(pairs, processing_times, due_dates, weights, before, after):
-    new_before = copy.deepcopy(before)
-    new_after = copy.deepcopy(after)
-
-    for k, l in pairs:
-        if check_kanet_conditions(
-            k, l, processing_times, due_dates, weights, new_before, new_after
-        ):
-            new_before[l].add(k)
-            new_after[k].add(l)
-        else:
-            return None, None
+                    change = True
+                else:
+                    # Undo the arcs added before the failure.
+                    for k, l in reversed(added):
+                        remove_arc(k, l, processing_times, state)
 
-    return new_before, new_after
+    return state["before"], state["after"]
 
 
-def check_kanet_conditions(i, j, processing_times, due_dates, weights, before, after):
-    jobs = {i for i in range(len(processing_times))}
+def check_kanet_conditions(
+    i,
+    j,
+    processing_times,
+    due_dates,
+    weights,
+    p_b_j,
+    p_common,
+    p_a_i_bar,
+    p_a_bar_common,
+):
     p_i = processing_times[i]
     w_i = weights[i]
     d_i = due_dates[i]
-    b_i = before[i]
-    a_i = after[i]
-    a_i_bar = jobs - a_i
     p_j = processing_times[j]
     w_j = weights[j]
     d_j = due_dates[j]
-    b_j = before[j]
-    a_j = after[j]
-    a_j_bar = jobs - a_j
-
-    p_b_j = sum(processing_times[k] for k in b_j)
-    p_common = sum(processing_times[k] for k in b_i | b_j) + p_i + p_j
 
     # K1
     k1_common = (w_i - w_j) * p_common / w_i
@@ -336,17 +433,13 @@ def check_kanet_conditions(i, j, processing_times, due_dates, weights, before, a
     ):
         return True
 
-    p_a_i_bar = sum(processing_times[k] for k in a_i_bar)
-
     # K2
     k2_common = (w_j - w_i) * p_a_i_bar / w_j
     if (
         p_i <= p_j
         and w_i < w_j
         and d_j >= k2_common + w_i * d_i / w_j
-        and d_j
-        >= k2_common
-        + w_i * (sum(processing_times[k] for k in a_i_bar & a_j_bar) - p_j) / w_j
+        and d_j >= k2_common + w_i * (p_a_bar_common - p_j) / w_j
     ):
         return True
 
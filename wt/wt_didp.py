@@ -9,8 +9,36 @@ import read_single_machine_scheduling
 start = time.perf_counter()
 
 
-def create_model(processing_times, due_dates, weights, before, add_time_var=False):
+def compute_ancestors(before):
+    ancestors = [None for _ in before]
+
+    def visit(j):
+        if ancestors[j] is None:
+            ancestors[j] = set(before[j])
+
+            for k in before[j]:
+                ancestors[j] |= visit(k)
+
+        return ancestors[j]
+
+    for j in range(len(before)):
+        visit(j)
+
+    return ancestors
+
+
+def create_model(
+    processing_times,
+    due_dates,
+    weights,
+    before,
+    add_time_var=False,
+    objective="wt",
+    earliness_weights=None,
+    tardiness_bound=False,
+):
     n = len(processing_times)
+    total_processing_time = sum(processing_times)
 
     model = dp.Model()
 
@@ -18,7 +46,8 @@ def create_model(processing_times, due_dates, weights, before, add_time_var=Fals
     scheduled = model.add_set_var(object_type=job, target=[])
 
     if add_time_var:
-        current_time = model.add_int_var(target=0)
+        # Carrying the time avoids summing the processing times of scheduled jobs.
+        current_time = model.add_int_resource_var(target=0, less_is_better=True)
 
     all_jobs = model.create_set_const(object_type=job, value=list(range(n)))
 
@@ -27,6 +56,9 @@ def create_model(processing_times, due_dates, weights, before, add_time_var=Fals
     weight = model.add_int_table(weights)
     predecessors = model.add_set_table(before, object_type=job)
 
+    if objective == "wet":
+        earliness_weight = model.add_int_table(earliness_weights)
+
     model.add_base_case([scheduled == all_jobs])
 
     name_to_job = {}
@@ -43,15 +75,81 @@ def create_model(processing_times, due_dates, weights, before, add_time_var=Fals
             current_time = processing_time[scheduled]
 
         tardiness = dp.max(0, current_time + processing_time[j] - due_date[j])
+
+        if objective == "wet":
+            earliness = dp.max(0, due_date[j] - current_time - processing_time[j])
+            cost = earliness_weight[j] * earliness + weight[j] * tardiness + state_cost
+        elif objective == "max-wt":
+            cost = dp.max(state_cost, weight[j] * tardiness)
+        else:
+            cost = weight[j] * tardiness + state_cost
+
         schedule = dp.Transition(
             name=name,
-            cost=weight[j] * tardiness + state_cost,
+            cost=cost,
             effects=effects,
             preconditions=[~scheduled.contains(j), predecessors[j].issubset(scheduled)],
         )
         model.add_transition(schedule)
 
-    model.add_dual_bound(0)
+    if objective == "wt" and tardiness_bound:
+        if not add_time_var:
+            current_time = processing_time[scheduled]
+
+        unscheduled = scheduled.complement()
+        ancestors = model.add_set_table(compute_ancestors(before), object_type=job)
+        last_tardiness_costs = [
+            weights[j] * max(0, total_processing_time - due_dates[j]) for j in range(n)
+        ]
+        # Each job completes after its unscheduled ancestors, and the last job
+        # completes at the total processing time.
+        bound = 0
+        last_job_bound = max(last_tardiness_costs)
+
+        for j in range(n):
+            earliest_tardiness_cost = weights[j] * dp.max(
+                0,
+                current_time
+                + processing_time[ancestors[j] & unscheduled]
+                + processing_times[j]
+                - due_dates[j],
+            )
+            bound += unscheduled.contains(j).if_then_else(earliest_tardiness_cost, 0)
+            last_job_bound = dp.min(
+                last_job_bound,
+                unscheduled.contains(j).if_then_else(
+                    last_tardiness_costs[j] - earliest_tardiness_cost,
+                    max(last_tardiness_costs),
+                ),
+            )
+
+        model.add_dual_bound(
+            unscheduled.is_empty().if_then_else(0, bound + last_job_bound)
+        )
+    elif objective == "wt":
+        model.add_dual_bound(0)
+    else:
+        # Some unscheduled job completes at the total processing time, and no job
+        # completes later.
+        unscheduled = scheduled.complement()
+        last_tardiness_cost = model.add_int_table(
+            [
+                weights[j] * max(0, total_processing_time - due_dates[j])
+                for j in range(n)
+            ]
+        )
+        bound = last_tardiness_cost.min(unscheduled)
+
+        if objective == "wet":
+            last_earliness_cost = model.add_int_table(
+                [
+                    earliness_weights[j] * max(0, due_dates[j] - total_processing_time)
+                    for j in range(n)
+                ]
+            )
+            bound = last_earliness_cost[unscheduled] + bound
+
+        model.add_dual_bound(unscheduled.is_empty().if_then_else(0, bound))
 
     return model, name_to_job
 
@@ -66,6 +164,7 @@ def solve(
     initial_beam_size=1,
     threads=1,
     parallel_type=0,
+    f_operator=dp.FOperator.Plus,
 ):
     if solver_name == "LNBS":
         if parallel_type == 2:
@@ -77,6 +176,7 @@ def solve(
 
         solver = dp.LNBS(
             model,
+            f_operator=f_operator,
             initial_beam_size=initial_beam_size,
             seed=seed,
             parallelization_method=parallelization_method,
@@ -85,23 +185,39 @@ def solve(
             quiet=False,
         )
     elif solver_name == "DD-LNS":
-        solver = dp.DDLNS(model, time_limit=time_limit, quiet=False, seed=seed)
+        solver = dp.DDLNS(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False, seed=seed
+        )
     elif solver_name == "FR":
         solver = dp.ForwardRecursion(model, time_limit=time_limit, quiet=False)
     elif solver_name == "BrFS":
-        solver = dp.BreadthFirstSearch(model, time_limit=time_limit, quiet=False)
+        solver = dp.BreadthFirstSearch(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "CAASDy":
-        solver = dp.CAASDy(model, time_limit=time_limit, quiet=False)
+        solver = dp.CAASDy(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "DFBB":
-        solver = dp.DFBB(model, time_limit=time_limit, quiet=False)
+        solver = dp.DFBB(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "CBFS":
-        solver = dp.CBFS(model, time_limit=time_limit, quiet=False)
+        solver = dp.CBFS(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "ACPS":
-        solver = dp.ACPS(model, time_limit=time_limit, quiet=False)
+        solver = dp.ACPS(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "APPS":
-        solver = dp.APPS(model, time_limit=time_limit, quiet=False)
+        solver = dp.APPS(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     elif solver_name == "DBDFS":
-        solver = dp.DBDFS(model, time_limit=time_limit, quiet=False)
+        solver = dp.DBDFS(
+            model, f_operator=f_operator, time_limit=time_limit, quiet=False
+        )
     else:
         if parallel_type == 2:
             parallelization_method = dp.BeamParallelizationMethod.Sbs
@@ -112,6 +228,7 @@ def solve(
 
         solver = dp.CABS(
             model,
+            f_operator=f_operator,
             initial_beam_size=initial_beam_size,
             threads=threads,
             parallelization_method=parallelization_method,
@@ -156,6 +273,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("input", type=str)
     parser.add_argument("--add-time-var", action="store_true")
+    parser.add_argument("--objective", default="wt", choices=["wt", "wet", "max-wt"])
+    parser.add_argument("--tardiness-bound", action="store_true")
     parser.add_argument("--time-out", default=1800, type=int)
     parser.add_argument("--history", default="history.csv", type=str)
     parser.add_argument("--config", default="CABS", type=str)
@@ -165,19 +284,43 @@ if __name__ == "__main__":
     parser.add_argument("--parallel-type", default=0, type=int)
     args = parser.parse_args()
 
-    (
+    if args.tardiness_bound and args.objective != "wt":
+        parser.error("--tardiness-bound only supports --objective wt")
+
+    if args.objective == "wet":
+        (
+            processing_times,
+            due_dates,
+            earliness_weights,
+            weights,
+        ) = read_single_machine_scheduling.read_wet(args.input)
+    else:
+        (
+            processing_times,
+            due_dates,
+            weights,
+        ) = read_single_machine_scheduling.read_wt(args.input)
+        earliness_weights = None
+
+    if args.objective == "wt":
+        before, _ = read_single_machine_scheduling.extract_precedence_for_wt(
+            processing_times, due_dates, weights
+        )
+    else:
+        # Kanet's conditions hold only for total weighted tardiness.
+        before = [set() for _ in processing_times]
+
+    model, name_to_job = create_model(
         processing_times,
         due_dates,
         weights,
-    ) = read_single_machine_scheduling.read_wt(args.input)
-    original_before = None
-    before, _ = read_single_machine_scheduling.extract_precedence_for_wt(
-        processing_times, due_dates, weights
-    )
-
-    model, name_to_job = create_model(
-        processing_times, due_dates, weights, before, add_time_var=args.add_time_var
+        before,
+        add_time_var=args.add_time_var,
+        objective=args.objective,
+        earliness_weights=earliness_weights,
+        tardiness_bound=args.tardiness_bound,
     )
+    f_operator = dp.FOperator.Max if args.objective == "max-wt" else dp.FOperator.Plus
     solution, cost, bound, is_optimal, is_infeasible = solve(
         model,
         name_to_job,
@@ -188,6 +331,7 @@ if __name__ == "__main__":
         threads=args.threads,
         initial_beam_size=args.initial_beam_size,
         parallel_type=args.parallel_type,
+        f_operator=f_operator,
     )
 
     if is_infeasible:
@@ -202,13 +346,31 @@ if __name__ == "__main__":
             if is_optimal:
                 print("optimal cost: {}".format(cost))
 
-            validation_result, _ = read_single_machine_scheduling.verify_wt(
-                solution,
-                processing_times,
-                due_dates,
-                weights,
-                cost=cost,
-            )
+            if args.objective == "wet":
+                validation_result = read_single_machine_scheduling.verify_wet(
+                    solution,
+                    cost,
+                    processing_times,
+                    due_dates,
+                    earliness_weights,
+                    weights,
+                )
+            elif args.objective == "max-wt":
+                validation_result, _ = read_single_machine_scheduling.verify_max_wt(
+                    solution,
+                    processing_times,
+                    due_dates,
+                    weights,
+                    cost=cost,
+                )
+            else:
+                validation_result, _ = read_single_machine_scheduling.verify_wt(
+                    solution,
+                    processing_times,
+                    due_dates,
+                    weights,
+                    cost=cost,
+                )
 
             if validation_result:
                 print("The solution is valid.")
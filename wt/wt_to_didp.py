@@ -26,8 +26,16 @@ def get_limit_resource(time_limit, memory_limit):
     return limit_resources
 
 
-def generate_problem(processing_times, due_dates, weights, before):
+def generate_problem(
+    processing_times,
+    due_dates,
+    weights,
+    before,
+    objective="wt",
+    earliness_weights=None,
+):
     n = len(processing_times)
+    total_processing_time = sum(processing_times)
     lines = [
         "object_numbers:",
         "    job: {}".format(n),
@@ -44,8 +52,40 @@ def generate_problem(processing_times, due_dates, weights, before):
         "    weight: {"
         + ", ".join("{}: {}".format(i, weights[i]) for i in range(n))
         + " }",
-        "    predecessors: {",
     ]
+
+    if objective == "wet":
+        lines.append(
+            "    earliness_weight: {"
+            + ", ".join("{}: {}".format(i, earliness_weights[i]) for i in range(n))
+            + " }"
+        )
+        lines.append(
+            "    last_earliness_cost: {"
+            + ", ".join(
+                "{}: {}".format(
+                    i,
+                    earliness_weights[i] * max(0, due_dates[i] - total_processing_time),
+                )
+                for i in range(n)
+            )
+            + " }"
+        )
+
+    if objective != "wt":
+        lines.append(
+            "    last_tardiness_cost: {"
+            + ", ".join(
+                "{}: {}".format(
+                    i, weights[i] * max(0, total_processing_time - due_dates[i])
+                )
+                for i in range(n)
+            )
+            + " }"
+        )
+
+    lines.append("    predecessors: {")
+
     for i in range(n):
         lines.append(
             "                 {}: [ ".format(i)
@@ -63,10 +103,16 @@ if __name__ == "__main__":
     parser.add_argument("--didp-path", "-d", type=str)
     parser.add_argument("--config-path", "-c", type=str)
     parser.add_argument("--precedence", action="store_true")
+    parser.add_argument("--objective", default="wt", choices=["wt", "wet", "max-wt"])
     parser.add_argument("--time-limit", default=None, type=int)
     parser.add_argument("--memory-limit", default=None, type=int)
     args = parser.parse_args()
 
+    if args.precedence and args.objective == "wet":
+        parser.error("--objective wet does not support --precedence")
+
+    earliness_weights = None
+
     if args.precedence:
         (
             processing_times,
@@ -76,9 +122,15 @@ if __name__ == "__main__":
             original_after,
         ) = read_single_machine_scheduling.read_wt_prec(args.input)
         before = original_before
-        before, _ = read_single_machine_scheduling.extract_precedence_for_wt_prec(
-            processing_times, due_dates, weights, original_before, original_after
-        )
+    elif args.objective == "wet":
+        (
+            processing_times,
+            due_dates,
+            earliness_weights,
+            weights,
+        ) = read_single_machine_scheduling.read_wet(args.input)
+        original_before = None
+        before = [set() for _ in processing_times]
     else:
         (
             processing_times,
@@ -86,16 +138,39 @@ if __name__ == "__main__":
             weights,
         ) = read_single_machine_scheduling.read_wt(args.input)
         original_before = None
-        before, _ = read_single_machine_scheduling.extract_precedence_for_wt(
-            processing_times, due_dates, weights
-        )
+        before = [set() for _ in processing_times]
 
-    problem = generate_problem(processing_times, due_dates, weights, before)
+    # Kanet's conditions hold only for total weighted tardiness.
+    if args.objective == "wt":
+        if args.precedence:
+            before, _ = read_single_machine_scheduling.extract_precedence_for_wt_prec(
+                processing_times, due_dates, weights, original_before, original_after
+            )
+        else:
+            before, _ = read_single_machine_scheduling.extract_precedence_for_wt(
+                processing_times, due_dates, weights
+            )
+
+    problem = generate_problem(
+        processing_times,
+        due_dates,
+        weights,
+        before,
+        objective=args.objective,
+        earliness_weights=earliness_weights,
+    )
 
     with open("problem.yaml", "w") as f:
         f.write(problem)
 
-    domain_path = os.path.join(os.path.dirname(__file__), "domain.yaml")
+    if args.objective == "wet":
+        domain_file = "domain_wet.yaml"
+    elif args.objective == "max-wt":
+        domain_file = "domain_max_wt.yaml"
+    else:
+        domain_file = "domain.yaml"
+
+    domain_path = os.path.join(os.path.dirname(__file__), domain_file)
 
     if args.didp_path is not None:
         fn = get_limit_resource(args.time_limit, args.memory_limit)
@@ -116,14 +191,34 @@ if __name__ == "__main__":
         print(solution)
         print("cost: {}".format(cost))
 
-        validation_result = read_single_machine_scheduling.verify_wt(
-            solution,
-            processing_times,
-            due_dates,
-            weights,
-            cost=cost,
-            before=original_before,
-        )
+        if args.objective == "wet":
+            validation_result = read_single_machine_scheduling.verify_wet(
+                solution,
+                cost,
+                processing_times,
+                due_dates,
+                earliness_weights,
+                weights,
+                before=original_before,
+            )
+        elif args.objective == "max-wt":
+            validation_result, _ = read_single_machine_scheduling.verify_max_wt(
+                solution,
+                processing_times,
+                due_dates,
+                weights,
+                cost=cost,
+                before=original_before,
+            )
+        else:
+            validation_result, _ = read_single_machine_scheduling.verify_wt(
+                solution,
+                processing_times,
+                due_dates,
+                weights,
+                cost=cost,
+                before=original_before,
+            )
 
         if validation_result:
             print("The solution is valid.")